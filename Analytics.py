@@ -49,13 +49,14 @@ def get_weekly_summary(data: pd.DataFrame) -> str:
         return "No data available for weekly summary."
 
     data = data.copy()
-    data["date"] = pd.to_datetime(data["date"], errors="coerce").dt.date
+    # Keep dates as datetime64 days so filtering and grouping stay vectorized
+    data["date"] = pd.to_datetime(data["date"], errors="coerce").dt.normalize()
     data.dropna(subset=["date"], inplace=True)
 
     if data.empty:
         return "No valid date data for weekly summary."
 
-    today = date.today()
+    today = pd.Timestamp(date.today())
     seven_days_ago = today - timedelta(days=6)
     recent_data = data[(data["date"] >= seven_days_ago) & (data["date"] <= today)]
 
@@ -96,15 +97,16 @@ def assess_burnout_risk(data: pd.DataFrame) -> str:
         return "Low"
 
     data = data.copy()
-    data["date"] = pd.to_datetime(data["date"], errors="coerce").dt.date
+    data["date"] = pd.to_datetime(data["date"], errors="coerce").dt.normalize()
     data.dropna(subset=["date"], inplace=True)
 
     if data.empty:
         return "Low"
 
     risk_score = 0
+    today = pd.Timestamp(date.today())
     
-    recent_data = data[data["date"] >= (date.today() - timedelta(days=13))]
+    recent_data = data[data["date"] >= today - timedelta(days=13)]
     if not recent_data.empty:
         daily_time = recent_data.groupby("date")["time_taken"].sum()
         long_workdays = daily_time[daily_time > 480]
@@ -117,9 +119,8 @@ def assess_burnout_risk(data: pd.DataFrame) -> str:
         if avg_daily_hours > 9:
             risk_score += 1
 
-    all_dates = pd.date_range(end=date.today(), periods=14, freq='D').date
-    logged_dates = set(data["date"].unique())
-    unlogged_days_in_period = [d for d in all_dates if d not in logged_dates and d <= date.today()]
+    all_dates = pd.date_range(end=today, periods=14, freq='D')
+    unlogged_days_in_period = all_dates[~all_dates.isin(data["date"])]
     if len(unlogged_days_in_period) >= 3:
         risk_score += 1
 
@@ -144,14 +145,14 @@ def get_workload_recommendations(data: pd.DataFrame) -> dict:
         return recommendations
 
     data = data.copy()
-    data["date"] = pd.to_datetime(data["date"], errors="coerce").dt.date
+    data["date"] = pd.to_datetime(data["date"], errors="coerce").dt.normalize()
     data.dropna(subset=["date"], inplace=True)
 
     if data.empty:
         recommendations["suggestion"] = "No valid date data for workload recommendations."
         return recommendations
 
-    recent_data = data[data["date"] >= (date.today() - timedelta(days=6))]
+    recent_data = data[data["date"] >= pd.Timestamp(date.today()) - timedelta(days=6)]
     if recent_data.empty:
         recommendations["suggestion"] = "Not enough recent data for workload recommendations. Log more tasks!"
         return recommendations
@@ -165,7 +166,7 @@ def get_workload_recommendations(data: pd.DataFrame) -> dict:
         recommendations["suggestion"] = f"Light schedule ({avg_daily/60:.1f}h daily). Room to tackle more goals or learn something new."
     
     if "category" in recent_data.columns:
-        cat_time = recent_data.groupby("category")["time_taken"].sum()
+        cat_time = recent_data.groupby("category", observed=True)["time_taken"].sum()
         total_time_in_cats = cat_time.sum()
         
         if total_time_in_cats > 0:
@@ -1,37 +1,38 @@
 # ==================== IMPORTS ====================
 # Core libraries
 import streamlit as st
-from datetime import datetime, date, timedelta, time
-from typing import List
+import math
+from time import monotonic
+from datetime import date, timedelta, time
 
 # Data processing
 import pandas as pd
 import plotly.graph_objects as go
 
 # App modules
-from data_handler import load_data, save_data, clean_data, add_manual_task
-from data_constants import COLUMN_ORDER
-from data_preprocessing import filter_by_date_range
-from utils import validate_dataframe, calculate_productivity_score, filter_recent_data
-
-# Analytics & ML
+from data_handler import (
+    load_data, save_data, add_manual_task, build_interval_index, get_data_version,
+    migrate_csv_to_parquet, read_import_csv, append_clean_tasks, task_keys
+)
+from data_constants import COLUMN_ORDER, TREND_ICONS, COMPLETION_TREND_ICONS
+from utils import calculate_productivity_score
+
+# Analytics
 from Analytics import get_peak_hours, get_weekly_summary, assess_burnout_risk, get_workload_recommendations
-from ml_models import MLModelHandler
-from insights import MLInsightsGenerator
-from recommendations import TaskRecommender
 
 # UI components
 from streamlit_autorefresh import st_autorefresh
-from charts import show_basic_charts
-from productivity_charts import show_productivity_charts
-from insight_charts import show_insight_charts
 
-# Time series forecasting
-from time_series_forecast import TimeSeriesForecaster
+# Chart, insight, forecasting and recommendation modules (and with them
+# scikit-learn) are imported inside their section guards below so hidden
+# sections never pay their import cost.
 
 # ==================== HEADER ====================
 st.set_page_config(page_title="🧠 NeuroTrack", layout="wide", initial_sidebar_state="expanded")
 
+# Define 'today' once per rerun and reuse it everywhere below
+today = date.today()
+
 # ==================== CUSTOM CSS STYLING ====================
 st.markdown("""
 <style>
@@ -218,7 +219,7 @@ import random
 from data_constants import PRODUCTIVITY_QUOTES
 
 # Use today's date as seed for consistent daily quote
-random.seed(date.today().toordinal())
+random.seed(today.toordinal())
 daily_quote = random.choice(PRODUCTIVITY_QUOTES)
 random.seed()  # Reset seed
 
@@ -231,20 +232,16 @@ st.markdown(f"""
     margin-bottom: 20px;
 ">
     <p style="font-size: 1.1rem; font-style: italic; color: #374151; margin: 0;">
-        💡 "{daily_quote['text']}"
+        💡 "{daily_quote.text}"
     </p>
     <p style="font-size: 0.9rem; color: #6366F1; margin: 8px 0 0 0; font-weight: 500;">
-        — {daily_quote['author']}
+        — {daily_quote.author}
     </p>
 </div>
 """, unsafe_allow_html=True)
 
 # ==================== Initialize Components ====================
-if "ml_handler" not in st.session_state:
-    st.session_state.ml_handler = MLModelHandler()
-    st.session_state.task_recommender = TaskRecommender()
-    st.session_state.insights_generator = MLInsightsGenerator()
-    st.session_state.forecaster = TimeSeriesForecaster()
+if "timer_running" not in st.session_state:
     st.session_state.ml_models_trained = False
     st.session_state.timer_running = False
     st.session_state.paused = False
@@ -260,17 +257,38 @@ if "ml_handler" not in st.session_state:
     st.session_state.setdefault('show_insights', True)
     st.session_state.setdefault('show_forecasting', True)
 
-# Load Data
+# Load Data (load_data cleans the tasks and caches them until the data files change)
 try:
+    migrate_csv_to_parquet()  # No-op once data.parquet exists
+    data_version = get_data_version()
     data = load_data()
-    if not data.empty:
-        data = clean_data(data)  # Ensure data is properly cleaned
 except Exception as e:
-    st.error(f"Error loading data: {e}")
-    data = pd.DataFrame(columns=COLUMN_ORDER)
-
-# Define 'today' once after data loading
-today = date.today()
+    # Every section below can save, and saving an empty stand-in frame would
+    # overwrite the stored tasks, so the page stops here until the data loads
+    st.error(f"{e}")
+    st.stop()
+
+# The data version changes on every save (and on outside edits to the files), so the
+# insight and chart caches below are keyed on it rather than on a content hash
+# recomputed every rerun, and never serve results for data that has since been written
+data_key = str(data_version)
+
+# Parse dates and build the today/this-week masks once; every section reuses them
+week_start = today - timedelta(days=today.weekday())
+data_dates = pd.to_datetime(data["date"], errors='coerce') if "date" in data.columns else pd.Series(pd.NaT, index=data.index)
+today_mask = data_dates.dt.normalize() == pd.Timestamp(today)
+week_mask = data_dates >= pd.Timestamp(week_start)
+
+# Whole-table completion rate, shared by the sidebar badge and the goals section
+completed_total = int(data["completed"].sum()) if "completed" in data.columns else 0
+completion_pct = (completed_total / len(data) * 100) if len(data) > 0 else 0
+
+# Category names for the filter bar, task form and task list. clean_data stores
+# the column as a categorical, so its categories are read without scanning rows.
+if "category" in data.columns and isinstance(data["category"].dtype, pd.CategoricalDtype):
+    category_options = data["category"].cat.categories.tolist()
+else:
+    category_options = data["category"].dropna().unique().tolist() if "category" in data.columns else []
 
 # ==================== SIDEBAR INFO ====================
 with st.sidebar:
@@ -281,17 +299,16 @@ with st.sidebar:
     with col_date1:
         st.write(f"👤 **Active**")
     with col_date2:
-        st.write(f"📅 {date.today().strftime('%b %d')}")
+        st.write(f"📅 {today:%b %d}")
     
     st.divider()
     
     # Quick Stats
     st.markdown("### 📊 Quick Stats")
     if not data.empty:
-        today_tasks = len(data[pd.to_datetime(data["date"], errors='coerce').dt.date == today])
-        week_start = today - timedelta(days=today.weekday())
-        week_tasks = len(data[pd.to_datetime(data["date"], errors='coerce') >= pd.Timestamp(week_start)])
-        completed_today = len(data[(pd.to_datetime(data["date"], errors='coerce').dt.date == today) & (data["completed"] == True)])
+        today_tasks = int(today_mask.sum())
+        week_tasks = int(week_mask.sum())
+        completed_today = int((today_mask & (data["completed"] == True)).sum())
         
         col_stat1, col_stat2 = st.columns(2)
         with col_stat1:
@@ -316,16 +333,14 @@ with st.sidebar:
     # Performance Badge
     if not data.empty and len(data) > 0:
         st.markdown("### 🎯 Performance")
-        completion_rate = (data["completed"].sum() / len(data) * 100) if len(data) > 0 else 0
-        
-        if completion_rate >= 80:
-            st.success(f"🏆 **Excellent** | {int(completion_rate)}%")
-        elif completion_rate >= 60:
-            st.info(f"⭐ **Good** | {int(completion_rate)}%")
-        elif completion_rate >= 40:
-            st.warning(f"💪 **Fair** | {int(completion_rate)}%")
+        if completion_pct >= 80:
+            st.success(f"🏆 **Excellent** | {int(completion_pct)}%")
+        elif completion_pct >= 60:
+            st.info(f"⭐ **Good** | {int(completion_pct)}%")
+        elif completion_pct >= 40:
+            st.warning(f"💪 **Fair** | {int(completion_pct)}%")
         else:
-            st.error(f"⚠️ **Needs Work** | {int(completion_rate)}%")
+            st.error(f"⚠️ **Needs Work** | {int(completion_pct)}%")
     
     st.divider()
     
@@ -382,31 +397,25 @@ with st.sidebar:
     )
     
     # Quick toggle buttons
+    # Callbacks run before the script reruns, so the checkboxes above pick up
+    # the new values in a single pass without an explicit st.rerun()
+    def set_all_sections(visible: bool):
+        st.session_state.show_statistics = visible
+        st.session_state.show_visualizations = visible
+        st.session_state.show_performance = visible
+        st.session_state.show_goals = visible
+        st.session_state.show_task_management = visible
+        st.session_state.show_insights = visible
+        st.session_state.show_forecasting = visible
+        st.session_state.show_import = visible
+
     st.markdown("#### Quick Actions")
     col_t1, col_t2 = st.columns(2)
     with col_t1:
-        if st.button("✅ Show All", use_container_width=True):
-            st.session_state.show_statistics = True
-            st.session_state.show_visualizations = True
-            st.session_state.show_performance = True
-            st.session_state.show_goals = True
-            st.session_state.show_task_management = True
-            st.session_state.show_insights = True
-            st.session_state.show_forecasting = True
-            st.session_state.show_import = True
-            st.rerun()
+        st.button("✅ Show All", use_container_width=True, on_click=set_all_sections, args=(True,))
     
     with col_t2:
-        if st.button("❌ Hide All", use_container_width=True):
-            st.session_state.show_statistics = False
-            st.session_state.show_visualizations = False
-            st.session_state.show_performance = False
-            st.session_state.show_goals = False
-            st.session_state.show_task_management = False
-            st.session_state.show_insights = False
-            st.session_state.show_forecasting = False
-            st.session_state.show_import = False
-            st.rerun()
+        st.button("❌ Hide All", use_container_width=True, on_click=set_all_sections, args=(False,))
 
 # ==================== DATA VALIDATION ALERTS ====================
 if not data.empty:
@@ -418,8 +427,9 @@ if not data.empty:
         validation_issues.append(f"Missing columns: {', '.join(missing_cols)}")
     
     # Check for missing values
-    if data.isnull().sum().sum() > 0:
-        null_counts = data.isnull().sum()
+    # One isnull pass; the per-column counts also give the total
+    null_counts = data.isnull().sum()
+    if null_counts.sum() > 0:
         null_cols = null_counts[null_counts > 0]
         validation_issues.append(f"Missing values in: {', '.join(null_cols.index.tolist())}")
     
@@ -436,14 +446,39 @@ if not data.empty:
 # Responsive layout detection
 is_mobile = st.session_state.get('is_mobile', False)
 
+# Today's open tasks, shared by the timer gate below and the Focus Timer section.
+# First row per task name, so picking a task is a dict lookup rather than a scan
+today_tasks = data[today_mask & (data["completed"] == False)]
+focus_rows = today_tasks.drop_duplicates("task")
+focus_lookup = dict(zip(focus_rows["task"], focus_rows.index))
 
-# ------------------ Dashboard Metrics ------------------
+def stop_focus_timer():
+    """Stops the focus timer and clears its countdown."""
+    st.session_state.timer_running = False
+    st.session_state.paused = False
+    st.session_state.remaining_time = 0
 
-score, prod_time, total_time_overall, completion_rate_overall = calculate_productivity_score(data)
-# Dashboard Metrics Display (Responsive)
-metric_cols = st.columns(2) if is_mobile else st.columns(4)
+# A timer whose task is no longer open today (completed, deleted, or the day
+# rolled over) has no Pause/Reset controls left, so it is stopped here
+if st.session_state.timer_running and st.session_state.current_task not in focus_lookup:
+    stop_focus_timer()
 
-with metric_cols[0]:
+# While the focus timer ticks, autorefresh reruns the whole script every second,
+# so the heavy analysis sections below are skipped to keep each tick cheap.
+# A paused timer doesn't refresh, so everything renders as usual.
+timer_active = st.session_state.timer_running and not st.session_state.paused
+
+
+# ------------------ Cached Figures ------------------
+# Figures depend only on the small aggregates they plot, so each builder is
+# keyed on those values and the same Figure object is reused across reruns.
+# st.cache_resource hands back the object itself; the figures are never mutated.
+# A fixed uirevision keeps the user's zoom, pan and legend toggles when a rerun
+# (e.g. each focus-timer tick) sends the chart again.
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def gauge_figure(score: float) -> go.Figure:
+    """Productivity score gauge, colored by score band."""
     # Determine gauge bar color based on score
     if score >= 90:
         bar_color = "#8B5CF6"  # Violet - Excellent
@@ -485,7 +520,112 @@ with metric_cols[0]:
         paper_bgcolor='rgba(0,0,0,0)',
         font={'color': '#F8FAFC'}
     )
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def category_pie_figure(labels: tuple, values: tuple) -> go.Figure:
+    """Donut chart of task counts per category."""
+    # Use modern category colors from constants
+    colors = ['#8B5CF6', '#06B6D4', '#10B981', '#F59E0B', '#EC4899', '#14B8A6', '#6366F1', '#F97316']
+    
+    fig_pie = go.Figure(data=[go.Pie(
+        labels=labels, 
+        values=values, 
+        hole=0.4,
+        marker=dict(colors=colors[:len(labels)], line=dict(color='#1E1B4B', width=2)),
+        textposition='inside',
+        textinfo='label+percent',
+        hovertemplate='<b>%{label}</b><br>Tasks: %{value}<br>Percentage: %{percent}<extra></extra>'
+    )])
+    
+    fig_pie.update_layout(
+        height=350,
+        showlegend=True,
+        font=dict(size=12, color='#F8FAFC'),
+        margin=dict(l=0, r=0, t=30, b=0),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        uirevision="category_pie"
+    )
+    return fig_pie
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def daily_time_figure(dates: tuple, minutes: tuple) -> go.Figure:
+    """Line chart of minutes spent per day."""
+    fig_trend = go.Figure(data=[
+        go.Scatter(x=dates, y=minutes, mode='lines+markers', 
+                  name='Minutes', line=dict(color='#8B5CF6', width=2),
+                  marker=dict(size=6, color='#8B5CF6'))
+    ])
+    fig_trend.update_layout(
+        title={'text': "Daily Time Investment", 'font': {'color': '#A5B4FC'}},
+        xaxis_title="Date",
+        yaxis_title="Minutes",
+        height=300,
+        hovermode='x unified',
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font={'color': '#F8FAFC'},
+        uirevision="daily_time"
+    )
+    return fig_trend
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def daily_score_figure(dates: tuple, scores: tuple) -> go.Figure:
+    """Filled area chart of daily completion percentage."""
+    fig_score = go.Figure(data=[
+        go.Scatter(x=dates, y=scores, fill='tozeroy', 
+                  name='Score', line=dict(color='#10B981', width=2),
+                  fillcolor='rgba(16, 185, 129, 0.2)')
+    ])
+    fig_score.update_layout(
+        xaxis_title="Date",
+        yaxis_title="Productivity %",
+        height=300,
+        hovermode='x',
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font={'color': '#F8FAFC'},
+        uirevision="daily_score"
+    )
+    return fig_score
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def priority_figure(priorities: tuple, counts: tuple) -> go.Figure:
+    """Bar chart of task counts per priority."""
+    colors = {"High": "#EF4444", "Medium": "#F59E0B", "Low": "#10B981"}
+    fig_priority = go.Figure(data=[
+        go.Bar(x=priorities, y=counts, 
+               marker=dict(color=[colors.get(p, '#6366F1') for p in priorities]))
+    ])
+    fig_priority.update_layout(
+        title={'text': "Tasks by Priority", 'font': {'color': '#A5B4FC'}},
+        xaxis_title="Priority",
+        yaxis_title="Count",
+        height=300,
+        showlegend=False,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font={'color': '#F8FAFC'},
+        uirevision="priority"
+    )
+    return fig_priority
+
+
+# ------------------ Dashboard Metrics ------------------
+
+score, prod_time, total_time_overall, completion_rate_overall = calculate_productivity_score(data)
+burnout_risk = assess_burnout_risk(data) if not data.empty else "Low"
+risk_color = "🔴" if burnout_risk == "High" else "🟡" if burnout_risk == "Medium" else "🟢"
+# Dashboard Metrics Display (Responsive)
+metric_cols = st.columns(2) if is_mobile else st.columns(4)
+
+with metric_cols[0]:
+    st.plotly_chart(gauge_figure(score), use_container_width=True)
 
 with metric_cols[1]:
     st.metric("⏱️ Focus Time", f"{int(prod_time)}m", f"/{int(total_time_overall)}m total")
@@ -494,16 +634,12 @@ if not is_mobile:
     with metric_cols[2]:
         st.metric("✅ Completion Rate", f"{completion_rate_overall}%")
     with metric_cols[3]:
-        burnout_risk = assess_burnout_risk(data) if not data.empty else "Low"
-        risk_color = "🔴" if burnout_risk == "High" else "🟡" if burnout_risk == "Medium" else "🟢"
         st.metric("🏥 Burnout Risk", f"{risk_color} {burnout_risk}")
 else:
     metric_cols2 = st.columns(2)
     with metric_cols2[0]:
         st.metric("✅ Completion Rate", f"{completion_rate_overall}%")
     with metric_cols2[1]:
-        burnout_risk = assess_burnout_risk(data) if not data.empty else "Low"
-        risk_color = "🔴" if burnout_risk == "High" else "🟡" if burnout_risk == "Medium" else "🟢"
         st.metric("🏥 Burnout Risk", f"{risk_color} {burnout_risk}")
 
 # ==================== ADVANCED FILTERS & SEARCH ====================
@@ -530,7 +666,7 @@ with filter_cols[0]:
         filter_start = None
 
 with filter_cols[1]:
-    categories = ["All"] + (data["category"].unique().tolist() if "category" in data.columns else [])
+    categories = ["All"] + category_options
     selected_category = st.selectbox("📂 Category", options=categories, key="cat_filter")
 
 with filter_cols[2]:
@@ -548,7 +684,7 @@ with filter_cols[4]:
 filtered_data = data.copy()
 
 if filter_start is not None and "date" in filtered_data.columns:
-    filtered_data = filtered_data[pd.to_datetime(filtered_data["date"], errors='coerce') >= pd.Timestamp(filter_start)]
+    filtered_data = filtered_data[data_dates >= pd.Timestamp(filter_start)]
 
 if selected_category != "All" and "category" in filtered_data.columns:
     filtered_data = filtered_data[filtered_data["category"] == selected_category]
@@ -579,7 +715,7 @@ if st.session_state.show_statistics:
         # Category breakdown
         with stats_col1:
             if "category" in filtered_data.columns:
-                cat_counts = filtered_data["category"].value_counts()
+                cat_counts = filtered_data["category"].value_counts().loc[lambda counts: counts > 0]
                 st.metric(
                     "📂 Categories",
                     cat_counts.index[0] if len(cat_counts) > 0 else "N/A",
@@ -609,7 +745,7 @@ if st.session_state.show_statistics:
         # Most productive category
         with stats_col4:
             if "category" in filtered_data.columns and "completed" in filtered_data.columns:
-                cat_completion = filtered_data.groupby("category")["completed"].agg(['sum', 'count'])
+                cat_completion = filtered_data.groupby("category", observed=True)["completed"].agg(['sum', 'count'])
                 cat_completion['rate'] = (cat_completion['sum'] / cat_completion['count'] * 100).fillna(0)
                 best_cat = cat_completion['rate'].idxmax() if len(cat_completion) > 0 else "N/A"
                 best_rate = cat_completion['rate'].max() if len(cat_completion) > 0 else 0
@@ -622,55 +758,24 @@ if st.session_state.show_statistics:
     # Category breakdown pie chart
     if not filtered_data.empty and "category" in filtered_data.columns:
         st.markdown("#### 📊 Category Distribution")
-        cat_data = filtered_data["category"].value_counts()
-        
-        # Use modern category colors from constants
-        colors = ['#8B5CF6', '#06B6D4', '#10B981', '#F59E0B', '#EC4899', '#14B8A6', '#6366F1', '#F97316']
-        
-        fig_pie = go.Figure(data=[go.Pie(
-            labels=cat_data.index, 
-            values=cat_data.values, 
-            hole=0.4,
-            marker=dict(colors=colors[:len(cat_data)], line=dict(color='#1E1B4B', width=2)),
-            textposition='inside',
-            textinfo='label+percent',
-            hovertemplate='<b>%{label}</b><br>Tasks: %{value}<br>Percentage: %{percent}<extra></extra>'
-        )])
-        
-        fig_pie.update_layout(
-            height=350,
-            showlegend=True,
-            font=dict(size=12, color='#F8FAFC'),
-            margin=dict(l=0, r=0, t=30, b=0),
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)'
+        cat_data = filtered_data["category"].value_counts().loc[lambda counts: counts > 0]
+        st.plotly_chart(
+            category_pie_figure(tuple(cat_data.index), tuple(cat_data.values.tolist())),
+            use_container_width=True
         )
-        st.plotly_chart(fig_pie, use_container_width=True)
 
     # Time trend analysis
     if not filtered_data.empty and "date" in filtered_data.columns:
         st.markdown("#### ⏱️ Time Trend (Last 30 Days)")
         try:
-            trend_data = filtered_data.copy()
-            trend_data["date"] = pd.to_datetime(trend_data["date"], errors='coerce')
-            daily_time = trend_data.groupby(trend_data["date"].dt.date)["time_taken"].sum().tail(30)
-            
-            fig_trend = go.Figure(data=[
-                go.Scatter(x=daily_time.index, y=daily_time.values, mode='lines+markers', 
-                          name='Minutes', line=dict(color='#8B5CF6', width=2),
-                          marker=dict(size=6, color='#8B5CF6'))
-            ])
-            fig_trend.update_layout(
-                title={'text': "Daily Time Investment", 'font': {'color': '#A5B4FC'}},
-                xaxis_title="Date",
-                yaxis_title="Minutes",
-                height=300,
-                hovermode='x unified',
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                font={'color': '#F8FAFC'}
+            # Group on the already-parsed datetime64 dates (no copy, no Python date objects);
+            # the chart only ever shows the last 30 days, so no downsampling is needed
+            trend_dates = data_dates.loc[filtered_data.index].dt.normalize()
+            daily_time = filtered_data["time_taken"].groupby(trend_dates).sum().tail(30)
+            st.plotly_chart(
+                daily_time_figure(tuple(daily_time.index), tuple(daily_time.values.tolist())),
+                use_container_width=True
             )
-            st.plotly_chart(fig_trend, use_container_width=True)
         except Exception as e:
             st.warning(f"Could not generate trend: {e}")
 
@@ -693,22 +798,10 @@ with perf_col1:
             daily_scores = daily_data.groupby(daily_data["date"].dt.date).apply(
                 lambda x: (x["completed"].sum() / len(x) * 100) if len(x) > 0 else 0
             ).tail(30)
-            
-            fig_score = go.Figure(data=[
-                go.Scatter(x=daily_scores.index, y=daily_scores.values, fill='tozeroy', 
-                          name='Score', line=dict(color='#10B981', width=2),
-                          fillcolor='rgba(16, 185, 129, 0.2)')
-            ])
-            fig_score.update_layout(
-                xaxis_title="Date",
-                yaxis_title="Productivity %",
-                height=300,
-                hovermode='x',
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                font={'color': '#F8FAFC'}
+            st.plotly_chart(
+                daily_score_figure(tuple(daily_scores.index), tuple(daily_scores.values.tolist())),
+                use_container_width=True
             )
-            st.plotly_chart(fig_score, use_container_width=True)
     except Exception as e:
         st.info("Insufficient data for trend analysis")
 
@@ -716,23 +809,11 @@ with perf_col2:
     st.markdown("#### 📊 Priority Distribution")
     try:
         if not filtered_data.empty and "priority" in filtered_data.columns:
-            priority_data = filtered_data["priority"].value_counts()
-            colors = {"High": "#EF4444", "Medium": "#F59E0B", "Low": "#10B981"}
-            fig_priority = go.Figure(data=[
-                go.Bar(x=priority_data.index, y=priority_data.values, 
-                       marker=dict(color=[colors.get(p, '#6366F1') for p in priority_data.index]))
-            ])
-            fig_priority.update_layout(
-                title={'text': "Tasks by Priority", 'font': {'color': '#A5B4FC'}},
-                xaxis_title="Priority",
-                yaxis_title="Count",
-                height=300,
-                showlegend=False,
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                font={'color': '#F8FAFC'}
+            priority_data = filtered_data["priority"].value_counts().loc[lambda counts: counts > 0]
+            st.plotly_chart(
+                priority_figure(tuple(priority_data.index), tuple(priority_data.values.tolist())),
+                use_container_width=True
             )
-            st.plotly_chart(fig_priority, use_container_width=True)
     except Exception as e:
         st.info("No priority data available")
 
@@ -742,25 +823,22 @@ with perf_col2:
 if st.session_state.show_goals:
     st.markdown("#### 🎯 Productivity Goals")
     goal_col1, goal_col2, goal_col3 = st.columns(3)
+    today_count = int(today_mask.sum())
+    week_hours = data.loc[week_mask, "time_taken"].sum() / 60 if "time_taken" in data.columns else 0
 
     with goal_col1:
         daily_goal = st.number_input("Daily Task Goal", min_value=1, max_value=50, value=5, step=1)
         if not data.empty and "date" in data.columns:
-            today_tasks = data[pd.to_datetime(data["date"], errors='coerce').dt.date == today]
-            st.metric("Today's Progress", f"{len(today_tasks)}/{daily_goal}", "tasks")
+            st.metric("Today's Progress", f"{today_count}/{daily_goal}", "tasks")
 
     with goal_col2:
         weekly_goal = st.number_input("Weekly Time Goal (hours)", min_value=1, max_value=100, value=40, step=5)
         if not data.empty and "date" in data.columns:
-            week_start = today - timedelta(days=today.weekday())
-            week_data = data[pd.to_datetime(data["date"], errors='coerce') >= pd.Timestamp(week_start)]
-            week_hours = week_data["time_taken"].sum() / 60
             st.metric("Week's Progress", f"{int(week_hours)}/{weekly_goal}h", "hours")
 
     with goal_col3:
         target_completion = st.number_input("Target Completion %", min_value=0, max_value=100, value=80, step=5)
         if not data.empty and "completed" in data.columns:
-            completion_pct = (data["completed"].sum() / len(data) * 100) if len(data) > 0 else 0
             st.metric("Completion Rate", f"{int(completion_pct)}%", f"Target: {target_completion}%")
 
     # Goal progress bars
@@ -769,15 +847,11 @@ if st.session_state.show_goals:
 
     with col_progress1:
         if not data.empty and "date" in data.columns:
-            today_tasks = data[pd.to_datetime(data["date"], errors='coerce').dt.date == today]
-            daily_progress = min(len(today_tasks) / daily_goal, 1.0)
+            daily_progress = min(today_count / daily_goal, 1.0)
             st.progress(daily_progress, text=f"Daily Goal: {int(daily_progress*100)}%")
 
     with col_progress2:
         if not data.empty and "date" in data.columns:
-            week_start = today - timedelta(days=today.weekday())
-            week_data = data[pd.to_datetime(data["date"], errors='coerce') >= pd.Timestamp(week_start)]
-            week_hours = week_data["time_taken"].sum() / 60
             weekly_progress = min(week_hours / weekly_goal, 1.0)
             st.progress(weekly_progress, text=f"Weekly Goal: {int(weekly_progress*100)}%")
 
@@ -792,32 +866,30 @@ if st.session_state.show_import:
 
     if uploaded_file is not None:
         try:
-            import_data = pd.read_csv(uploaded_file)
-            import_data = clean_data(import_data)  # Clean imported data
+            import_data = read_import_csv(uploaded_file)  # Parsed and cleaned chunk by chunk
             
             st.write("Preview of imported data:")
             st.dataframe(import_data.head())
             
+            def import_tasks(new_tasks: pd.DataFrame):
+                try:
+                    # Both sides are already clean; only cross-file duplicates are dropped
+                    save_data(append_clean_tasks(load_data(), new_tasks))
+                    
+                    # Reset ML models to retrain with new data
+                    st.session_state.ml_models_trained = False
+                    
+                    st.toast(f"✅ Successfully imported {len(new_tasks)} tasks!")
+                except Exception as e:
+                    st.error(f"Error importing data: {e}")
+
             col1, col2 = st.columns(2)
             with col1:
-                if st.button("Import Data", type="primary"):
-                    try:
-                        # Combine with existing data
-                        data = pd.concat([data, import_data], ignore_index=True)
-                        data = clean_data(data)
-                        save_data(data)
-                        
-                        # Reset ML models to retrain with new data
-                        st.session_state.ml_models_trained = False
-                        
-                        st.success(f"✅ Successfully imported {len(import_data)} tasks!")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(f"Error importing data: {e}")
+                st.button("Import Data", type="primary", on_click=import_tasks, args=(import_data,))
             
             with col2:
-                if st.button("Cancel Import"):
-                    st.rerun()
+                # The click itself reruns the script; nothing else to do
+                st.button("Cancel Import")
                     
         except Exception as e:
             st.error(f"Error reading CSV file: {e}")
@@ -836,14 +908,13 @@ with st.expander("Create New Task", expanded=True):
         col1, col2 = st.columns(2)
         with col1:
             task_name = st.text_input("Task Name*", help="Required field")
-            task_date = st.date_input("Date*", datetime.now().date())
+            task_date = st.date_input("Date*", today)
             
             # Dynamic category selection
-            existing_cats = data["category"].unique().tolist()
             category = st.selectbox(
                 "Category*", 
-                options=["New Category"] + existing_cats,
-                index=0 if "New Category" in existing_cats else 1
+                options=["New Category"] + category_options,
+                index=0 if "New Category" in category_options or not category_options else 1
             )
             if category == "New Category":
                 category = st.text_input("Enter New Category Name*")
@@ -902,7 +973,11 @@ with st.expander("Create New Task", expanded=True):
         # Form submission
         if st.form_submit_button("Add Task", type="primary"):
             try:
-                data = add_manual_task(
+                # The per-day interval index survives this task's save, so consecutive
+                # adds reuse it; any other write changes the data version and rebuilds it
+                if st.session_state.get("interval_index_version") != data_version:
+                    st.session_state.interval_index = build_interval_index(data)
+                add_manual_task(
                     df=data,
                     task_name=task_name,
                     time_taken=duration,
@@ -916,8 +991,11 @@ with st.expander("Create New Task", expanded=True):
                     intent=intent,
                     difficulty=difficulty,
                     tags=tags,
-                    notes=notes
+                    notes=notes,
+                    interval_index=st.session_state.interval_index,
+                    return_data=False # The rerun below reloads the data
                 )
+                st.session_state.interval_index_version = get_data_version()
                 st.success(f"Task '{task_name}' added successfully!")
                 st.rerun()
             except Exception as e:
@@ -925,15 +1003,48 @@ with st.expander("Create New Task", expanded=True):
 
 st.divider()
 
+if timer_active:
+    st.info("⏳ Focus timer running — insights, charts, forecasts and task management are hidden until it is paused or stopped.")
+    # The timer's own controls only show while its task is selected, so it can always be stopped here
+    st.button("🛑 Stop Timer", key="stop_timer_notice", on_click=stop_focus_timer)
+
 # ==================== AI INSIGHTS SECTION ====================
-if not data.empty and len(data) > 5 and st.session_state.show_insights:
+# Insights are keyed on the loaded data's version (and today's date, which
+# the weekly and workload summaries depend on), so reruns that leave the data
+# unchanged reuse the previous results instead of recomputing them.
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def cached_peak_hours(data_key: str, _data: pd.DataFrame) -> list:
+    """Peak productivity hours for the loaded data."""
+    return get_peak_hours(_data)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def cached_weekly_summary(data_key: str, as_of: date, _data: pd.DataFrame) -> str:
+    """This week's summary for the loaded data as of the given day."""
+    return get_weekly_summary(_data)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def cached_workload_recommendations(data_key: str, as_of: date, _data: pd.DataFrame) -> dict:
+    """Workload balance recommendations for the loaded data as of the given day."""
+    return get_workload_recommendations(_data)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def cached_ml_insights(data_key: str, generator_id: int, _generator, _data: pd.DataFrame) -> dict:
+    """ML insights for the loaded data; a new generator instance invalidates the entry."""
+    return _generator.generate_insights(_data)
+
+
+if not data.empty and len(data) > 5 and st.session_state.show_insights and not timer_active:
     st.markdown("## 🤖 AI Insights")
     
     insight_tabs = st.tabs(["📊 Peak Hours", "📝 Weekly Summary", "⚖️ Workload Balance", "🧠 ML Insights"])
     
     with insight_tabs[0]:
         try:
-            peak_hours = get_peak_hours(data)
+            peak_hours = cached_peak_hours(data_key, data)
             if peak_hours:
                 st.markdown("#### ⏰ Your Peak Performance Hours")
                 for i, (hour_range, productivity) in enumerate(peak_hours[:3]):
@@ -947,7 +1058,7 @@ if not data.empty and len(data) > 5 and st.session_state.show_insights:
     
     with insight_tabs[1]:
         try:
-            weekly_summary = get_weekly_summary(data)
+            weekly_summary = cached_weekly_summary(data_key, today, data)
             if weekly_summary:
                 st.markdown("#### 📈 This Week's Analysis")
                 st.markdown(weekly_summary)
@@ -956,7 +1067,7 @@ if not data.empty and len(data) > 5 and st.session_state.show_insights:
     
     with insight_tabs[2]:
         try:
-            recommendations = get_workload_recommendations(data)
+            recommendations = cached_workload_recommendations(data_key, today, data)
             if recommendations:
                 st.markdown("#### ⚖️ Workload Balance")
                 for rec_type, message in recommendations.items():
@@ -967,7 +1078,12 @@ if not data.empty and len(data) > 5 and st.session_state.show_insights:
     
     with insight_tabs[3]:
         try:
-            ml_insights = st.session_state.insights_generator.generate_insights(data)
+            from insights import MLInsightsGenerator
+            if "insights_generator" not in st.session_state:
+                st.session_state.insights_generator = MLInsightsGenerator()
+            ml_insights = cached_ml_insights(
+                data_key, id(st.session_state.insights_generator), st.session_state.insights_generator, data
+            )
             if ml_insights:
                 st.markdown("#### 🧠 Machine Learning Insights")
                 for insight_type, message in ml_insights.items():
@@ -985,14 +1101,18 @@ if not data.empty and len(data) > 5 and st.session_state.show_insights:
             st.error(f"Error generating ML insights: {e}")
 
 # ==================== DATA VISUALIZATION ====================
-if not data.empty and st.session_state.show_visualizations:
+if not data.empty and st.session_state.show_visualizations and not timer_active:
     st.markdown("## 📊 Data Visualization")
+    from charts import show_basic_charts
+    from productivity_charts import show_productivity_charts
+    from insight_charts import show_insight_charts
+
     tab1, tab2, tab3 = st.tabs(["📈 Basic Overview", "💪 Productivity Metrics", "🔍 Deep Insights"])
     
     with st.spinner("Rendering visualizations..."):
         with tab1:
             st.markdown("### Task Overview & Trends")
-            show_basic_charts(data)
+            show_basic_charts(data, data_key)
             
         with tab2:
             st.markdown("### Productivity Analysis")
@@ -1000,12 +1120,12 @@ if not data.empty and st.session_state.show_visualizations:
             
         with tab3:
             st.markdown("### Advanced Insights")
-            show_insight_charts(data)
+            show_insight_charts(data, data_key)
 
 st.divider()
 
 # ==================== TIME SERIES FORECASTING ====================
-if not data.empty and len(data) >= 3 and st.session_state.show_forecasting:
+if not data.empty and len(data) >= 3 and st.session_state.show_forecasting and not timer_active:
     st.markdown("## 📈 Time Series Forecasting")
     st.markdown("Predict future productivity trends based on historical patterns")
     
@@ -1019,9 +1139,12 @@ if not data.empty and len(data) >= 3 and st.session_state.show_forecasting:
         forecast_horizon = st.slider("Forecast Horizon (days)", min_value=3, max_value=30, value=7, step=1)
     
     with col_settings2:
-        st.info(f"📅 Forecasting from {(date.today() + timedelta(days=1)).strftime('%B %d')} to {(date.today() + timedelta(days=forecast_horizon)).strftime('%B %d, %Y')}")
+        st.info(f"📅 Forecasting from {today + timedelta(days=1):%B %d} to {today + timedelta(days=forecast_horizon):%B %d, %Y}")
     
     try:
+        from time_series_forecast import TimeSeriesForecaster
+        if "forecaster" not in st.session_state:
+            st.session_state.forecaster = TimeSeriesForecaster()
         forecaster = st.session_state.forecaster
         
         # Generate forecast summary
@@ -1036,11 +1159,11 @@ if not data.empty and len(data) >= 3 and st.session_state.show_forecasting:
             with metric_col1:
                 if 'productivity' in summary:
                     prod = summary['productivity']
-                    trend_icon = "📈" if "increasing" in prod.get('trend', '') else "📉"
+                    prod_trend = prod.get('trend', 'stable')
                     st.metric(
                         "Avg Productivity", 
                         f"{prod.get('avg_forecast', 0):.1f}%",
-                        delta=f"{prod.get('trend', 'stable')} {trend_icon}"
+                        delta=f"{prod_trend} {TREND_ICONS.get(prod_trend, '')}"
                     )
             
             with metric_col2:
@@ -1055,21 +1178,20 @@ if not data.empty and len(data) >= 3 and st.session_state.show_forecasting:
             with metric_col3:
                 if 'workload' in summary:
                     wl = summary['workload']
-                    trend_icon = "📈" if "increasing" in wl.get('trend', '') else "📉"
                     st.metric(
                         "Total Workload", 
                         f"{wl.get('total_hours_forecast', 0):.1f}h",
-                        delta=f"{wl.get('avg_daily_hours', 0):.1f}h/day {trend_icon}"
+                        delta=f"{wl.get('avg_daily_hours', 0):.1f}h/day {TREND_ICONS.get(wl.get('trend', 'stable'), '')}"
                     )
             
             with metric_col4:
                 if 'completion' in summary:
                     comp = summary['completion']
-                    trend_icon = "✅" if "improving" in comp.get('trend', '') else "⚠️"
+                    comp_trend = comp.get('trend', 'stable')
                     st.metric(
                         "Completion Rate", 
                         f"{comp.get('avg_rate', 0):.1f}%",
-                        delta=f"{comp.get('trend', 'stable')} {trend_icon}"
+                        delta=f"{comp_trend} {COMPLETION_TREND_ICONS.get(comp_trend, '')}"
                     )
         
         st.divider()
@@ -1238,17 +1360,17 @@ if not data.empty and len(data) >= 3 and st.session_state.show_forecasting:
         st.error(f"Error generating forecasts: {e}")
         st.info("💡 Tip: Time series forecasting works best with 7+ days of data, but will show estimates with 3+ tasks.")
 
-elif st.session_state.show_forecasting and not data.empty and len(data) < 3:
+elif st.session_state.show_forecasting and not data.empty and len(data) < 3 and not timer_active:
     st.markdown("## 📈 Time Series Forecasting")
     st.info("📊 Add at least 3 tasks to enable time series forecasting predictions")
 
 # ==================== TASK MANAGEMENT SECTION ====================
-if not data.empty and st.session_state.show_task_management:
+if not data.empty and st.session_state.show_task_management and not timer_active:
     st.markdown("### 📋 Task Management")
     st.divider()
     
     st.markdown("#### Recent Tasks")
-    filter_category = st.selectbox("Filter by Category", ["All"] + list(data["category"].unique()))
+    filter_category = st.selectbox("Filter by Category", ["All"] + category_options)
     show_completed = st.checkbox("Show completed tasks", value=True)
     
     filtered_data = data.copy()
@@ -1258,47 +1380,63 @@ if not data.empty and st.session_state.show_task_management:
         filtered_data = filtered_data[filtered_data["completed"] == False]
     
     display_data = filtered_data.sort_values("date", ascending=False).head(20)
+
+    # One editable table instead of a row of widgets per task. Edits are applied
+    # in the on_change callback, before the rerun, so the whole page renders the
+    # updated data in one pass; the editor resets because its data changed.
+    editor_columns = ["task", "date", "time_taken", "category", "priority", "completed"]
+    editor_data = display_data[editor_columns].assign(delete=False)
+
+    def apply_task_edits(row_keys):
+        changes = st.session_state.task_editor
+        try:
+            current = load_data()
+            # Edited rows are found by task key rather than index label, since the
+            # reloaded frame may be indexed differently; tasks that are gone are skipped
+            row_lookup = dict(zip(task_keys(current), current.index))
+            to_delete = []
+            for position, edits in changes.get("edited_rows", {}).items():
+                task_idx = row_lookup.get(row_keys[int(position)])
+                if task_idx is None:
+                    continue
+                if edits.get("delete"):
+                    to_delete.append(task_idx)
+                elif "completed" in edits:
+                    current.at[task_idx, "completed"] = bool(edits["completed"])
+            if to_delete:
+                current = current.drop(to_delete).reset_index(drop=True)
+            save_data(current)
+        except Exception as e:
+            st.error(f"Error updating tasks: {e}")
     
     if not display_data.empty:
-        for idx, task in display_data.iterrows():
-            col1, col2, col3 = st.columns([0.65, 0.25, 0.1])
-            
-            with col1:
-                # Status badge
-                status_emoji = "✅" if task["completed"] else "⏳"
-                status_color = "green" if task["completed"] else "orange"
-                
-                # Priority color badge
-                priority = str(task.get("priority", "Medium")).upper()
-                priority_color = "🔴" if "HIGH" in priority else "🟠" if "MEDIUM" in priority else "🟡"
-                
-                # Display task with badges
-                st.write(f"{status_emoji} **{task['task']}** {priority_color} `{task['category']}` — {int(task['time_taken'])}m")
-            
-            
-            with col2:
-                if not task["completed"]:
-                    if st.button("Mark Complete", key=f"complete_{idx}"):
-                        try:
-                            data.at[idx, "completed"] = True
-                            save_data(data)
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"Error updating task: {e}")
-            
-            with col3:
-                if st.button("🗑️", key=f"delete_{idx}", help="Delete task"):
-                    try:
-                        data = data.drop(idx).reset_index(drop=True)
-                        save_data(data)
-                        st.rerun()
-                    except Exception as e:
-                        st.error(f"Error deleting task: {e}")
+        st.data_editor(
+            editor_data,
+            key="task_editor",
+            on_change=apply_task_edits,
+            args=(task_keys(display_data),),
+            disabled=editor_columns[:-1],
+            column_config={
+                "task": st.column_config.TextColumn("Task", width="large"),
+                "date": st.column_config.DateColumn("Date"),
+                "time_taken": st.column_config.NumberColumn("Minutes", format="%d"),
+                "category": "Category",
+                "priority": "Priority",
+                "completed": st.column_config.CheckboxColumn("Done"),
+                "delete": st.column_config.CheckboxColumn("🗑️ Delete", help="Delete task")
+            },
+            hide_index=True,
+            use_container_width=True
+        )
     else:
         st.info("No tasks found with current filters.")
 
 # Smart task recommendations
-if not data.empty:
+if not data.empty and not timer_active:
+    from recommendations import TaskRecommender
+    if "task_recommender" not in st.session_state:
+        st.session_state.task_recommender = TaskRecommender()
+
     st.markdown("### 💡 Task Recommendations")
     with st.expander("Get personalized suggestions", expanded=True):
         rec_df = data.copy()
@@ -1352,47 +1490,49 @@ if not data.empty:
                         if recs.empty:
                             st.warning("No close matches found. Try a different context task or include completed tasks.")
                         else:
-                            recs = recs.copy()
-                            if "similarity_score" in recs.columns:
-                                recs["similarity_score"] = recs["similarity_score"].round(3)
-
                             display_cols = [
                                 col for col in ["task", "category", "priority", "time_taken", "similarity_score", "reason"]
                                 if col in recs.columns
                             ]
+                            # Relabel and format at render time instead of copying/renaming the frame
                             st.dataframe(
-                                recs[display_cols].rename(columns={
+                                recs[display_cols],
+                                column_config={
                                     "task": "Suggested Task",
                                     "time_taken": "Estimated Minutes",
-                                    "similarity_score": "Similarity",
+                                    "similarity_score": st.column_config.ProgressColumn(
+                                        "Similarity", min_value=0, max_value=1, format="%.3f"
+                                    ),
                                     "reason": "Why this"
-                                }),
+                                },
                                 use_container_width=True,
                                 hide_index=True
                             )
 # Focus Timer
 st.markdown("## 🎯 Focus Timer")
-today_tasks = data[(data["date"] == today) & (data["completed"] == False)]
-
 if not today_tasks.empty:
-    task_options = today_tasks["task"].unique().tolist()
+    task_options = focus_rows["task"].tolist()
     focus_task = st.selectbox("Pick a task to focus on:", task_options, key="selected_focus_task")
 
     if focus_task:
-        task_row = today_tasks[today_tasks["task"] == focus_task].iloc[0]
+        task_idx = focus_lookup[focus_task]
+        task_row = data.loc[task_idx]
         estimated_time = int(task_row["time_taken"])
         st.write(f"⏱️ Estimated time: {estimated_time} mins")
 
         if st.button("▶️ Start Timer") and not st.session_state.timer_running:
             st.session_state.timer_running = True
+            st.session_state.paused = False
             st.session_state.remaining_time = estimated_time * 60
+            st.session_state.deadline = monotonic() + estimated_time * 60
             st.session_state.current_task = focus_task
 
         if st.session_state.timer_running and st.session_state.current_task == focus_task:
-            countdown = st_autorefresh(interval=1000, key="timer_refresh")
-            
-            if countdown and not st.session_state.paused:
-                st.session_state.remaining_time -= 1
+            # Remaining time is derived from a fixed deadline, so it stays accurate
+            # however often (or rarely) the autorefresh actually reruns the script.
+            if not st.session_state.paused:
+                st_autorefresh(interval=1000, key="timer_refresh")
+                st.session_state.remaining_time = max(0, math.ceil(st.session_state.deadline - monotonic()))
             
             mins = st.session_state.remaining_time // 60
             secs = st.session_state.remaining_time % 60
@@ -1400,16 +1540,21 @@ if not today_tasks.empty:
             st.progress((estimated_time * 60 - st.session_state.remaining_time) / (estimated_time * 60))
             st.markdown(f"⏳ Time Left: **{mins:02}:{secs:02}**")
             
-            if st.button("⏸ Pause"):
+            if st.session_state.paused:
+                if st.button("▶️ Resume"):
+                    st.session_state.paused = False
+                    st.session_state.deadline = monotonic() + st.session_state.remaining_time
+                    st.rerun()
+            elif st.button("⏸ Pause"):
+                # remaining_time keeps the value computed above until Resume
                 st.session_state.paused = True
+                st.rerun()
             if st.button("🛑 Reset"):
-                st.session_state.timer_running = False
-                st.session_state.remaining_time = 0
+                stop_focus_timer()
             
             if st.session_state.remaining_time <= 0:
                 st.session_state.timer_running = False
                 st.success("🎉 Time's up!")
-                task_idx = today_tasks[today_tasks["task"] == focus_task].index[0]
                 data.at[task_idx, "completed"] = True
                 save_data(data)
                 st.rerun()
@@ -4,17 +4,71 @@ import streamlit as st
 
 # Data processing
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date
 
 # Visualization
 import plotly.express as px
 import plotly.graph_objects as go
 
 # Local modules
-from data_preprocessing import prepare_datetime_columns, filter_by_days_back
+from data_preprocessing import prepare_datetime_columns, filter_by_date_range, dataframe_fingerprint
 
-def show_basic_charts(data: pd.DataFrame):
-    """Display basic productivity overview charts with error handling."""
+BASIC_CHART_COLUMNS = ["date", "task", "time_taken", "category", "completed"]
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _basic_aggregates(data_key: str, as_of: date, _data: pd.DataFrame) -> dict:
+    """
+    Compute the numbers behind the basic overview charts.
+    
+    Args:
+        data_key: Identifies the data version, used as the cache key
+        as_of: Day the 14-day activity window ends on (part of the cache key)
+        _data: Task DataFrame (excluded from Streamlit's argument hashing)
+        
+    Returns:
+        Dict of metrics, category totals, completion counts and daily totals,
+        or an empty dict when no task has a positive time_taken
+    """
+    data = prepare_datetime_columns(_data)
+    data["time_taken"] = pd.to_numeric(data["time_taken"], errors="coerce").fillna(0)
+    data = data[data["time_taken"] > 0]
+    if data.empty:
+        return {}
+    
+    has_completed = "completed" in data.columns
+    completed = int(data["completed"].sum()) if has_completed else 0
+    
+    cat_data = None
+    if "category" in data.columns:
+        cat_data = data.groupby("category", observed=True).agg({
+            "time_taken": "sum",
+            "task": "count"
+        }).reset_index()
+    
+    recent_data = filter_by_date_range(data, start_date=as_of - timedelta(days=13), end_date=as_of)
+    daily_stats = recent_data.groupby("date")["time_taken"].sum().reset_index()
+    
+    return {
+        "total_tasks": len(data),
+        "total_minutes": data["time_taken"].sum(),
+        "completed": completed if has_completed else None,
+        "avg_time": data["time_taken"].mean(),
+        "cat_data": cat_data,
+        "completion_counts": (completed, len(data) - completed) if has_completed else None,
+        "daily_stats": daily_stats
+    }
+
+
+def show_basic_charts(data: pd.DataFrame, data_key: str = None):
+    """
+    Display basic productivity overview charts with error handling.
+    
+    Args:
+        data: Task DataFrame
+        data_key: Identifies this version of the data for the aggregate cache
+            (e.g. get_data_version()); a fingerprint of the chart columns is used if omitted
+    """
     try:
         st.markdown("## 📊 Basic Overview")
         
@@ -22,50 +76,39 @@ def show_basic_charts(data: pd.DataFrame):
             st.info("No data available for basic charts")
             return
     
-        # Clean data using shared utility
-        data = data.copy()
+        # Aggregates are cached per data key; only the figures are built here
         try:
-            data = prepare_datetime_columns(data, copy=False)
+            if data_key is None:
+                data_key = dataframe_fingerprint(data, BASIC_CHART_COLUMNS)
+            aggregates = _basic_aggregates(data_key, date.today(), data)
         except Exception as e:
-            st.error(f"Error processing datetime columns: {str(e)}")
+            st.error(f"Error processing chart data: {str(e)}")
             return
         
-        try:
-            data["time_taken"] = pd.to_numeric(data["time_taken"], errors="coerce").fillna(0)
-        except Exception as e:
-            st.error(f"Error processing time_taken column: {str(e)}")
-            return
-        
-        data = data[data["time_taken"] > 0]
-        if data.empty:
+        if not aggregates:
             st.warning("No valid time data available for charts")
             return
     
         # Quick metrics
         col1, col2, col3, col4 = st.columns(4)
         try:
+            total_tasks = aggregates["total_tasks"]
             with col1:
-                st.metric("📋 Total Tasks", len(data))
+                st.metric("📋 Total Tasks", total_tasks)
             with col2:
-                st.metric("⏱️ Total Hours", f"{data['time_taken'].sum()/60:.1f}")
+                st.metric("⏱️ Total Hours", f"{aggregates['total_minutes']/60:.1f}")
             with col3:
-                completed = data[data["completed"] == True] if "completed" in data.columns else pd.DataFrame()
-                st.metric("✅ Completed", f"{len(completed)}/{len(data)}")
+                st.metric("✅ Completed", f"{aggregates['completed'] or 0}/{total_tasks}")
             with col4:
-                avg_time = data['time_taken'].mean() if len(data) > 0 else 0
-                st.metric("⭐ Avg Time", f"{avg_time:.0f} min")
+                st.metric("⭐ Avg Time", f"{aggregates['avg_time']:.0f} min")
         except Exception as e:
             st.error(f"Error calculating metrics: {str(e)}")
     
         # Category distribution
         try:
             st.markdown("### ⏱️ Time Allocation by Category")
-            if "category" in data.columns:
-                cat_data = data.groupby("category").agg({
-                    "time_taken": "sum",
-                    "task": "count"
-                }).reset_index()
-                
+            cat_data = aggregates["cat_data"]
+            if cat_data is not None:
                 if not cat_data.empty:
                     # Define category colors for consistency
                     colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8', '#F7DC6F', '#BB8FCE', '#85C1E2']
@@ -98,10 +141,10 @@ def show_basic_charts(data: pd.DataFrame):
         # Completion status
         try:
             st.markdown("### Task Completion Status")
-            if "completed" in data.columns:
+            if aggregates["completion_counts"] is not None:
                 completion_data = pd.DataFrame({
                     "Status": ["Completed", "Pending"],
-                    "Count": [data["completed"].sum(), len(data) - data["completed"].sum()]
+                    "Count": list(aggregates["completion_counts"])
                 })
                 
                 fig = px.bar(
@@ -120,24 +163,23 @@ def show_basic_charts(data: pd.DataFrame):
         # Recent activity
         try:
             st.markdown("### Recent Activity (Last 14 Days)")
-            recent_data = filter_by_days_back(data, days=14)
+            daily_stats = aggregates["daily_stats"]
             
-            if recent_data is not None and not recent_data.empty:
-                daily_stats = recent_data.groupby("date")["time_taken"].sum().reset_index()
-                
-                if not daily_stats.empty:
-                    fig = px.bar(
-                        daily_stats,
-                        x="date",
-                        y="time_taken",
-                        title="Daily Time Investment",
-                        labels={"time_taken": "Minutes", "date": "Date"}
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.info("No activity data available for the last 14 days")
+            if not daily_stats.empty:
+                fig = go.Figure(go.Bar(
+                    x=daily_stats["date"],
+                    y=daily_stats["time_taken"],
+                    hovertemplate="Date=%{x}<br>Minutes=%{y}<extra></extra>"
+                ))
+                fig.update_layout(
+                    title="Daily Time Investment",
+                    xaxis_title="Date",
+                    yaxis_title="Minutes",
+                    uirevision="basic_daily" # Keep zoom/pan across reruns
+                )
+                st.plotly_chart(fig, use_container_width=True)
             else:
-                st.info("No recent activity data available")
+                st.info("No activity data available for the last 14 days")
         except Exception as e:
             st.error(f"Error creating recent activity chart: {str(e)}")
     
@@ -4,8 +4,13 @@ Unified constants for the NeuroTrack application.
 Includes data schema, defaults, types, validation rules, and UI settings.
 """
 
+from types import MappingProxyType
+from typing import NamedTuple
+
 # ==================== COLUMN DEFINITIONS ====================
-COLUMN_ORDER = [
+# A tuple, like the values of CATEGORICAL_FIELDS, so the shared schema can't be
+# changed in place; wrap it in list() where pandas needs a list (e.g. df[list(COLUMN_ORDER)])
+COLUMN_ORDER = (
     "date",
     "task",
     "start_time",
@@ -22,36 +27,37 @@ COLUMN_ORDER = [
     "notes",
     "task_type",
     "completed"
-]
+)
 
 # ==================== DATA DEFAULTS ====================
-# Used consistently across all modules when filling NaN values
-NUMERIC_DEFAULTS = {
+# Used consistently across all modules when filling NaN values.
+# Shared lookup tables are read-only views so no caller can change them for everyone else.
+NUMERIC_DEFAULTS = MappingProxyType({
     "time_taken": 0.0,        # float: minutes
     "energy_level": 5,        # int: 1-10 scale
     "focus_level": 5,         # int: 1-10 scale
     "difficulty": 3           # int: 1-5 scale
-}
+})
 
-CATEGORICAL_DEFAULTS = {
+CATEGORICAL_DEFAULTS = MappingProxyType({
     "priority": "Medium",
     "mood": "😐 Neutral",
     "intent": "Complete",
     "category": "General",
     "task_type": "manual"
-}
+})
 
-STRING_DEFAULTS = {
+STRING_DEFAULTS = MappingProxyType({
     "notes": "",
     "tags": ""
-}
+})
 
-BOOLEAN_DEFAULTS = {
+BOOLEAN_DEFAULTS = MappingProxyType({
     "completed": False
-}
+})
 
 # Flat dictionary for backward compatibility
-DEFAULT_VALUES = {
+DEFAULT_VALUES = MappingProxyType({
     "completed": False,
     "time_taken": 0.0,
     "energy_level": 5,
@@ -63,36 +69,40 @@ DEFAULT_VALUES = {
     "tags": "",
     "notes": "",
     "task_type": "manual"
-}
+})
 
 # ==================== DATA TYPE DEFINITIONS ====================
 # Strictly define expected types for each column
-COLUMN_TYPES = {
+COLUMN_TYPES = MappingProxyType({
     "date": "date",              # Python date object
     "task": "str",               # lowercase, stripped
     "start_time": "datetime64",  # pandas datetime
     "end_time": "datetime64",    # pandas datetime
     "time_taken": "float",       # minutes
-    "category": "str",
-    "priority": "str",           # "Low", "Medium", "High"
-    "mood": "str",               # emoji mood
+    "category": "category",      # pandas categorical
+    "priority": "category",      # "Low", "Medium", "High"
+    "mood": "category",          # emoji mood
     "energy_level": "int",       # 1-10
     "focus_level": "int",        # 1-10
-    "intent": "str",             # "Complete", "Learn", etc.
+    "intent": "category",        # "Complete", "Learn", etc.
     "difficulty": "int",         # 1-5
     "tags": "list",              # list of strings
     "notes": "str",
-    "task_type": "str",
+    "task_type": "category",     # e.g. "manual"
     "completed": "bool"
-}
+})
+
+# Low-cardinality label columns stored as pandas categoricals after cleaning;
+# those listed in CATEGORICAL_FIELDS use that list as their leading categories
+CATEGORY_DTYPE_COLUMNS = ["category", "priority", "mood", "intent", "task_type"]
 
 # ==================== DATA VALIDATION RULES ====================
-NUMERIC_RANGES = {
+NUMERIC_RANGES = MappingProxyType({
     "energy_level": (1, 10),
     "focus_level": (1, 10),
     "difficulty": (1, 5),
     "time_taken": (0, float('inf'))
-}
+})
 
 NUMERIC_FIELDS = {
     "energy_level": {"min": 1, "max": 10, "default": 5},
@@ -104,11 +114,11 @@ NUMERIC_FIELDS = {
 VALID_PRIORITY_VALUES = ["Low", "Medium", "High"]
 VALID_INTENT_VALUES = ["Complete", "Learn", "Review", "Plan", "Practice", "Explore"]
 
-CATEGORICAL_FIELDS = {
-    "priority": ["Low", "Medium", "High"],
-    "intent": ["Complete", "Learn", "Review", "Plan", "Practice", "Explore"],
-    "mood": ["😊 Happy", "😐 Neutral", "😞 Tired", "😤 Frustrated", "💪 Energized"]
-}
+CATEGORICAL_FIELDS = MappingProxyType({
+    "priority": ("Low", "Medium", "High"),
+    "intent": ("Complete", "Learn", "Review", "Plan", "Practice", "Explore"),
+    "mood": ("😊 Happy", "😐 Neutral", "😞 Tired", "😤 Frustrated", "💪 Energized")
+})
 
 # ==================== DATA SERIALIZATION RULES ====================
 # How to convert to/from CSV format
@@ -142,27 +152,44 @@ PRIORITY_COLORS = {
     'Low': '#1d4ed8'      # Blue (cool)
 }
 
+# Forecast trend badges, keyed by the canonical trend values from TimeSeriesForecaster
+TREND_ICONS = {
+    'increasing': '📈',
+    'decreasing': '📉',
+    'stable': '➡️'
+}
+
+COMPLETION_TREND_ICONS = {
+    'improving': '✅',
+    'declining': '⚠️',
+    'stable': '➡️'
+}
+
 # ==================== MOTIVATIONAL QUOTES ====================
 # Daily productivity quotes for inspiration
-PRODUCTIVITY_QUOTES = [
-    {"text": "The only way to do great work is to love what you do.", "author": "Steve Jobs"},
-    {"text": "Don't watch the clock; do what it does. Keep going.", "author": "Sam Levenson"},
-    {"text": "The future depends on what you do today.", "author": "Mahatma Gandhi"},
-    {"text": "Success is the sum of small efforts repeated day in and day out.", "author": "Robert Collier"},
-    {"text": "Your time is limited, don't waste it living someone else's life.", "author": "Steve Jobs"},
-    {"text": "The way to get started is to quit talking and begin doing.", "author": "Walt Disney"},
-    {"text": "Don't wait. The time will never be just right.", "author": "Napoleon Hill"},
-    {"text": "You don't have to see the whole staircase, just take the first step.", "author": "Martin Luther King Jr."},
-    {"text": "Quality is not an act, it is a habit.", "author": "Aristotle"},
-    {"text": "The only impossible journey is the one you never begin.", "author": "Tony Robbins"},
-    {"text": "Your future is created by what you do today, not tomorrow.", "author": "Robert Kiyosaki"},
-    {"text": "Productivity is never an accident. It's always a result of commitment.", "author": "Unknown"},
-    {"text": "Do something today that your future self will thank you for.", "author": "Sean Patrick Flanery"},
-    {"text": "Excellence is not a destination; it is a continuous journey that never ends.", "author": "Brian Tracy"},
-    {"text": "The secret of getting ahead is getting started.", "author": "Mark Twain"},
-    {"text": "You don't rise to the level of your goals, you fall to the level of your systems.", "author": "James Clear"},
-    {"text": "Small daily improvements are the key to staggering long-term results.", "author": "Robin Sharma"},
-    {"text": "Motivation is what gets you started. Habit is what keeps you going.", "author": "Jim Ryun"},
-    {"text": "The best time for new beginnings is now.", "author": "Unknown"},
-    {"text": "Progress, not perfection.", "author": "Unknown"},
-]
+class Quote(NamedTuple):
+    text: str
+    author: str
+
+PRODUCTIVITY_QUOTES = (
+    Quote("The only way to do great work is to love what you do.", "Steve Jobs"),
+    Quote("Don't watch the clock; do what it does. Keep going.", "Sam Levenson"),
+    Quote("The future depends on what you do today.", "Mahatma Gandhi"),
+    Quote("Success is the sum of small efforts repeated day in and day out.", "Robert Collier"),
+    Quote("Your time is limited, don't waste it living someone else's life.", "Steve Jobs"),
+    Quote("The way to get started is to quit talking and begin doing.", "Walt Disney"),
+    Quote("Don't wait. The time will never be just right.", "Napoleon Hill"),
+    Quote("You don't have to see the whole staircase, just take the first step.", "Martin Luther King Jr."),
+    Quote("Quality is not an act, it is a habit.", "Aristotle"),
+    Quote("The only impossible journey is the one you never begin.", "Tony Robbins"),
+    Quote("Your future is created by what you do today, not tomorrow.", "Robert Kiyosaki"),
+    Quote("Productivity is never an accident. It's always a result of commitment.", "Unknown"),
+    Quote("Do something today that your future self will thank you for.", "Sean Patrick Flanery"),
+    Quote("Excellence is not a destination; it is a continuous journey that never ends.", "Brian Tracy"),
+    Quote("The secret of getting ahead is getting started.", "Mark Twain"),
+    Quote("You don't rise to the level of your goals, you fall to the level of your systems.", "James Clear"),
+    Quote("Small daily improvements are the key to staggering long-term results.", "Robin Sharma"),
+    Quote("Motivation is what gets you started. Habit is what keeps you going.", "Jim Ryun"),
+    Quote("The best time for new beginnings is now.", "Unknown"),
+    Quote("Progress, not perfection.", "Unknown"),
+)
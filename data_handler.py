@@ -4,47 +4,216 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta, date, time
 import os
+import csv
+import bisect
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 # Local modules
 from data_constants import (
     COLUMN_ORDER, NUMERIC_DEFAULTS, CATEGORICAL_DEFAULTS,
-    STRING_DEFAULTS, BOOLEAN_DEFAULTS, DATETIME_FORMAT, DATE_FORMAT, TAGS_SEPARATOR
+    STRING_DEFAULTS, BOOLEAN_DEFAULTS, CATEGORY_DTYPE_COLUMNS,
+    DATETIME_FORMAT, DATE_FORMAT, TAGS_SEPARATOR, NUMERIC_RANGES, CATEGORICAL_FIELDS
 )
+from data_preprocessing import split_tags
+
+DATA_FILE = "data.parquet"
+LEGACY_CSV_FILE = "data.csv"  # Read when no Parquet file exists yet; the next save migrates it
+PENDING_CSV_FILE = "data.pending.csv"  # Tasks appended since the last full save; save_data folds them in
+PENDING_FLUSH_ROWS = 32  # Appended tasks collected before they are folded into the Parquet file
+IMPORT_CHUNK_SIZE = 50_000    # Rows parsed per chunk when importing an uploaded CSV
+DUPLICATE_KEY_COLUMNS = ["date", "task", "start_time", "time_taken"] # Rows matching on all of these are duplicates
+
+# Read hints for task CSVs: text columns skip type inference, and dates are parsed
+# in C using the formats the app writes (values in other formats are left to clean_data)
+CSV_TEXT_DTYPES = {col: str for col in ["task", "category", "priority", "mood", "intent", "tags", "notes", "task_type"]}
+CSV_DATE_FORMATS = {"date": DATE_FORMAT, "start_time": DATETIME_FORMAT, "end_time": DATETIME_FORMAT}
+# Tasks are timed to the minute, so start/end times are held at second resolution
+# (Parquet stores them as milliseconds and CSV parsing gives nanoseconds)
+TASK_DATETIME_COLUMNS = ["start_time", "end_time"]
+TASK_DATETIME_DTYPE = "datetime64[s]"
+
+# Last result of load_data and the (path, mtime_ns, size) of the files it was read from
+_CACHE_KEY = None
+_CACHE_DF = None
+# Tasks add_manual_task appended since _CACHE_DF was built; load_data merges them into it
+_RECORDS_BUFFER = []
+# Writes this process has made to the task files. Part of get_data_version, so the
+# version changes on every save even when it leaves the files' mtime and size as they were
+_WRITE_COUNT = 0
+
+# Fill values and target types clean_data applies to each column that is present
+# (category keeps its NaNs; tags are parsed separately)
+CLEAN_FILL_VALUES = {
+    **NUMERIC_DEFAULTS,
+    "priority": CATEGORICAL_DEFAULTS["priority"],
+    "mood": CATEGORICAL_DEFAULTS["mood"],
+    "intent": CATEGORICAL_DEFAULTS["intent"],
+    "task_type": CATEGORICAL_DEFAULTS["task_type"],
+    "notes": STRING_DEFAULTS["notes"],
+    **BOOLEAN_DEFAULTS
+}
+CLEAN_DTYPES = {
+    "time_taken": "float32", # Minutes; float32 holds whole and half minutes exactly
+    "energy_level": "int8",  # 1-10 and 1-5 scales, so one byte per value is plenty
+    "focus_level": "int8",
+    "difficulty": "int8",
+    "priority": str,
+    "mood": str,
+    "intent": str,
+    "notes": str,
+    "task_type": str,
+    "completed": bool
+}
+
+def get_data_path() -> str:
+    """
+    Returns the file tasks are loaded from: the Parquet store, or the legacy
+    CSV until the first save has migrated it.
+    """
+    if not os.path.exists(DATA_FILE) and os.path.exists(LEGACY_CSV_FILE):
+        return LEGACY_CSV_FILE
+    return DATA_FILE
+
+def _data_files_key() -> tuple:
+    """Identifies the on-disk state of the task file and pending log by path, mtime and size."""
+    key = []
+    for path in (get_data_path(), PENDING_CSV_FILE):
+        if os.path.exists(path):
+            stat = os.stat(path)
+            key.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(key)
+
+def get_data_version() -> tuple:
+    """
+    Returns a key that changes whenever the stored tasks do: the number of writes this
+    process has made plus the (path, mtime_ns, size) of the task file and pending append
+    log, so caches keyed on it are invalidated by every save as well as by outside edits.
+    """
+    return (_WRITE_COUNT, _data_files_key())
 
-DATA_FILE = "data.csv"
+def _invalidate_load_cache():
+    """Forgets the cached load_data result after this process writes the task files."""
+    global _CACHE_KEY, _CACHE_DF
+    _CACHE_KEY = None
+    _CACHE_DF = None
+    _RECORDS_BUFFER.clear()
+
+def _merge_buffered_records() -> pd.DataFrame:
+    """
+    Appends the buffered tasks to the cached frame with a single concat, however many
+    were added since it was built. The records are built with clean types, so only the
+    categorical columns need re-typing. An empty store is replaced outright, since
+    clean_data leaves its columns untyped and concat would widen them to object.
+    """
+    global _CACHE_DF
+    new_df = _records_to_frame(_RECORDS_BUFFER)
+    if _CACHE_DF.empty:
+        _CACHE_DF = new_df
+    else:
+        _CACHE_DF = pd.concat([_CACHE_DF, new_df], ignore_index=True)
+    categorize_columns(_CACHE_DF)
+    _RECORDS_BUFFER.clear()
+    return _CACHE_DF
+
+def migrate_csv_to_parquet() -> bool:
+    """
+    One-time conversion of a legacy data.csv (plus any pending appends) into data.parquet.
+    The CSV is left in place as a backup; once the Parquet file exists it is no longer read,
+    so nothing is written unless the CSV's tasks were actually read.
+    
+    Returns:
+        bool: True if a migration was performed.
+        
+    Raises:
+        Exception: If the CSV can't be read (from load_data).
+    """
+    if os.path.exists(DATA_FILE) or not os.path.exists(LEGACY_CSV_FILE):
+        return False
+    data = load_data()
+    if data.empty and _count_csv_rows(LEGACY_CSV_FILE) > 0:
+        print(f"No valid tasks read from '{LEGACY_CSV_FILE}'; skipping migration to '{DATA_FILE}'.")
+        return False
+    save_data(data)
+    print(f"Migrated '{LEGACY_CSV_FILE}' to '{DATA_FILE}'.")
+    return True
 
 def load_data() -> pd.DataFrame:
     """
-    Loads data from data.csv, ensuring correct data types for AI/ML compatibility.
+    Loads data from data.parquet (or a legacy data.csv) plus any tasks in the pending
+    append log, ensuring correct data types for AI/ML compatibility.
     Converts time-related columns to datetime objects.
+    The cleaned result is cached until the files change; callers get their own copy.
+    
+    Raises:
+        Exception: If the stored tasks can't be read. An empty frame is only returned
+            when no task file exists, so a failed read is never saved over the store.
     """
-    if not os.path.exists(DATA_FILE):
+    global _CACHE_KEY, _CACHE_DF
+    files_key = _data_files_key()
+    if files_key and files_key == _CACHE_KEY:
+        if _RECORDS_BUFFER:
+            _merge_buffered_records()
+        return _CACHE_DF.copy()
+
+    data_path = get_data_path()
+    has_pending = os.path.exists(PENDING_CSV_FILE)
+    if not os.path.exists(data_path) and not has_pending:
         # Create an empty DataFrame with the defined columns if the file doesn't exist
         empty_df = pd.DataFrame(columns=COLUMN_ORDER)
-        print(f"'{DATA_FILE}' not found. Creating an empty DataFrame.")
+        print(f"'{data_path}' not found. Creating an empty DataFrame.")
         return empty_df
     
     try:
-        df = pd.read_csv(DATA_FILE)
+        frames = []
+        if data_path == DATA_FILE and os.path.exists(DATA_FILE):
+            table = pq.read_table(DATA_FILE)
+            df = table.to_pandas()
+            if "tags" in table.column_names:
+                # Arrow converts list<string> straight to Python lists (pandas would give arrays)
+                df["tags"] = table.column("tags").to_pylist()
+            frames.append(df)
+        elif data_path == LEGACY_CSV_FILE:
+            frames.append(_read_task_csv(LEGACY_CSV_FILE))
+        if has_pending:
+            frames.append(_read_task_csv(PENDING_CSV_FILE))
+        # concat can't combine datetime columns of different units, so align them first
+        frames = [_to_task_datetimes(frame) for frame in frames]
+        # An empty store would only widen the pending tasks' dtypes (and concat warns about it)
+        frames = [frame for frame in frames if not frame.empty] or frames[:1]
+        df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
         
         # Use clean_data for robust conversion after initial load
-        df = clean_data(df) # Call clean_data immediately after loading
+        df = clean_data(df, inplace=True) # df was just read, so it can be cleaned without a copy
+        _CACHE_KEY, _CACHE_DF = files_key, df
         
-        print(f"Data loaded successfully from '{DATA_FILE}'.")
-        return df
+        print(f"Data loaded successfully from '{data_path}'.")
+        return df.copy()
     except Exception as e:
-        print(f"Error loading data from '{DATA_FILE}': {e}")
-        # Return an empty DataFrame with correct columns on error
-        return pd.DataFrame(columns=COLUMN_ORDER)
+        raise Exception(f"Error loading data from '{data_path}': {e}") from e
+
+def _read_task_csv(path: str) -> pd.DataFrame:
+    """Reads a CSV written by the app with its known schema instead of inferring types."""
+    columns = pd.read_csv(path, nrows=0).columns # Older files may lack some date columns
+    return pd.read_csv(
+        path,
+        dtype=CSV_TEXT_DTYPES,
+        parse_dates=[col for col in CSV_DATE_FORMATS if col in columns],
+        date_format=CSV_DATE_FORMATS
+    )
 
 def save_data(df: pd.DataFrame):
     """
-    Saves the DataFrame to data.csv, ensuring consistent column order and no index.
-    Converts datetime objects back to ISO format strings for saving.
+    Saves the DataFrame to data.parquet, ensuring consistent column order and no index.
+    Dates and times are stored as native timestamps, so no string formatting is needed.
     """
+    global _WRITE_COUNT
+    _WRITE_COUNT += 1
+    _invalidate_load_cache()
     if df.empty:
-        # If DataFrame is empty, create an empty CSV file with headers
-        pd.DataFrame(columns=COLUMN_ORDER).to_csv(DATA_FILE, index=False)
+        # If DataFrame is empty, create an empty Parquet file with the expected columns
+        pd.DataFrame(columns=COLUMN_ORDER).to_parquet(DATA_FILE, index=False)
+        _clear_pending_log()
         print(f"Empty DataFrame saved to '{DATA_FILE}'.")
         return
     
@@ -62,41 +231,117 @@ def save_data(df: pd.DataFrame):
             else:
                 df[col] = ""
 
-    # Convert datetime objects to ISO format strings before saving
+    # Store date/time columns as timestamps so every save writes the same schema
     if 'start_time' in df.columns:
-        # Ensure it's datetime first, then format to full timestamp
-        df["start_time"] = pd.to_datetime(df["start_time"], errors='coerce').dt.strftime(DATETIME_FORMAT)
+        df["start_time"] = pd.to_datetime(df["start_time"], errors='coerce')
     if 'end_time' in df.columns:
-        # Ensure it's datetime first, then format to full timestamp
-        df["end_time"] = pd.to_datetime(df["end_time"], errors='coerce').dt.strftime(DATETIME_FORMAT)
+        df["end_time"] = pd.to_datetime(df["end_time"], errors='coerce')
     if 'date' in df.columns:
-        # For date objects, convert to datetime first then format
-        df["date"] = pd.to_datetime(df["date"], errors='coerce').dt.strftime(DATE_FORMAT)
+        # Python date objects become midnight timestamps; clean_data turns them back into dates
+        df["date"] = pd.to_datetime(df["date"], errors='coerce')
 
-    # Convert tags list to comma-separated string for CSV saving
+    # Tags are stored as lists; text values (e.g. from CSV) are split first
     if 'tags' in df.columns:
-        df['tags'] = df['tags'].apply(lambda x: TAGS_SEPARATOR.join(x) if isinstance(x, list) else x)
-        df['tags'] = df['tags'].fillna('') # Fill NaN tags (which would be float nan) with empty string
+        df['tags'] = split_tags(df['tags'])
 
     # Select and reorder columns
-    df = df[COLUMN_ORDER]
+    df = df[list(COLUMN_ORDER)]
     
     try:
-        df.to_csv(DATA_FILE, index=False)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        # Pin tags to list<string>; inference would give list<null> when every list is empty
+        tags_index = table.schema.get_field_index("tags")
+        table = table.set_column(tags_index, "tags", pa.array(df["tags"].tolist(), type=pa.list_(pa.string())))
+        pq.write_table(table, DATA_FILE, compression="zstd")
+        # df was built from load_data, so appended tasks are now in the Parquet file
+        _clear_pending_log()
         print(f"Data saved successfully to '{DATA_FILE}'.")
     except Exception as e:
         print(f"Error saving data to '{DATA_FILE}': {e}")
 
-def clean_data(df: pd.DataFrame) -> pd.DataFrame:
+def flush_pending(force: bool = False) -> bool:
+    """
+    Folds the pending append log into the Parquet file with one full save once it holds
+    PENDING_FLUSH_ROWS tasks, so bulk adds pay for one rewrite per batch instead of one per task.
+    The log is already on disk, so unflushed tasks are never lost; load_data reads them either way.
+    
+    Args:
+        force (bool): Flush whatever is pending regardless of how many tasks it holds.
+        
+    Returns:
+        bool: True if the log was folded into the Parquet file.
+    """
+    if not os.path.exists(PENDING_CSV_FILE):
+        return False
+    if not force and _count_csv_rows(PENDING_CSV_FILE) < PENDING_FLUSH_ROWS:
+        return False
+    save_data(load_data())
+    return True
+
+def _count_csv_rows(path: str) -> int:
+    """Counts the data rows of a CSV file, not including its header."""
+    with open(path, newline="", encoding="utf-8") as f:
+        return max(sum(1 for _ in csv.reader(f)) - 1, 0)
+
+def _clear_pending_log():
+    """Removes the pending append log once a full save has written its tasks."""
+    if os.path.exists(PENDING_CSV_FILE):
+        os.remove(PENDING_CSV_FILE)
+
+def append_task_row(task: dict):
+    """
+    Appends a single task to the pending CSV log instead of rewriting every stored task.
+    load_data merges the log back in, and the next save_data folds it into the Parquet file.
+    
+    Args:
+        task (dict): Task values keyed by column name; missing columns are written empty.
+    """
+    _invalidate_load_cache()
+    _write_pending_row(task)
+
+def _write_pending_row(task: dict):
+    """Writes one task to the pending CSV log, adding the header when the log is new."""
+    global _WRITE_COUNT
+    _WRITE_COUNT += 1
+    values = []
+    for col in COLUMN_ORDER:
+        value = task.get(col, "")
+        if isinstance(value, datetime):
+            value = value.strftime(DATETIME_FORMAT)
+        elif isinstance(value, date):
+            value = value.strftime(DATE_FORMAT)
+        elif isinstance(value, list):
+            value = TAGS_SEPARATOR.join(str(tag) for tag in value)
+        values.append(value)
+
+    write_header = not os.path.exists(PENDING_CSV_FILE) or os.path.getsize(PENDING_CSV_FILE) == 0
+    with open(PENDING_CSV_FILE, "a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if write_header:
+            writer.writerow(COLUMN_ORDER)
+        writer.writerow(values)
+
+def clean_data(df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
     """
     Cleans the DataFrame by converting data types, normalizing task names,
     dropping invalid rows, and removing duplicates.
     Handles new AI/ML readiness fields.
+    
+    Args:
+        df (pd.DataFrame): The tasks to clean.
+        inplace (bool): Modify df instead of a copy of it, for callers that own a freshly
+            read frame. Rows are still filtered into a new frame, so always use the result.
     """
     if df.empty:
         return df
 
-    cleaned_df = df.copy()
+    cleaned_df = df if inplace else df.copy()
+
+    # Already-cleaned frames carry categoricals, which reject fill values outside
+    # their categories; work on plain objects and re-type them at the end
+    for col in CATEGORY_DTYPE_COLUMNS:
+        if col in cleaned_df.columns and isinstance(cleaned_df[col].dtype, pd.CategoricalDtype):
+            cleaned_df[col] = cleaned_df[col].astype(object)
 
     # Ensure 'date' column is properly converted and invalid entries are handled
     if "date" in cleaned_df.columns:
@@ -108,51 +353,40 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
         cleaned_df.dropna(subset=["date"], inplace=True)
 
     # Convert to datetime objects, coercing errors will turn invalid dates into NaT
-    if "start_time" in cleaned_df.columns:
-        cleaned_df["start_time"] = pd.to_datetime(cleaned_df["start_time"], errors="coerce")
-    if "end_time" in cleaned_df.columns:
-        cleaned_df["end_time"] = pd.to_datetime(cleaned_df["end_time"], errors="coerce")
-    
-    if "time_taken" in cleaned_df.columns:
-        cleaned_df["time_taken"] = pd.to_numeric(cleaned_df["time_taken"], errors="coerce").fillna(0.0) # Ensure float and fill NaN
+    _to_task_datetimes(cleaned_df)
     
+    # Numeric columns may arrive as text (CSV); unparseable values become NaN and get the default below
+    numeric_cols = [col for col in NUMERIC_DEFAULTS if col in cleaned_df.columns]
+    cleaned_df[numeric_cols] = cleaned_df[numeric_cols].apply(pd.to_numeric, errors="coerce")
+    # Scores too large for their narrow type would wrap around, so treat them as unparseable too
+    for col in numeric_cols:
+        if np.dtype(CLEAN_DTYPES[col]).kind == "i":
+            limits = np.iinfo(CLEAN_DTYPES[col])
+            cleaned_df[col] = cleaned_df[col].where(cleaned_df[col].between(limits.min, limits.max))
+
     # Normalize task names: lowercase and strip spaces
     if "task" in cleaned_df.columns:
-        cleaned_df["task"] = cleaned_df["task"].astype(str).str.lower().str.strip()
-    
-    # Fill 'completed' NaNs with False and convert to boolean
-    if "completed" in cleaned_df.columns:
-        cleaned_df["completed"] = cleaned_df["completed"].fillna(False).astype(bool)
-
-    # Handle new columns: fill NaNs and convert types
-    # These defaults are applied if columns are missing or contain NaNs after loading
-    if "priority" in cleaned_df.columns:
-        cleaned_df["priority"] = cleaned_df["priority"].fillna(CATEGORICAL_DEFAULTS["priority"]).astype(str)
-    if "mood" in cleaned_df.columns:
-        cleaned_df["mood"] = cleaned_df["mood"].fillna(CATEGORICAL_DEFAULTS["mood"]).astype(str)
-    if "energy_level" in cleaned_df.columns:
-        cleaned_df["energy_level"] = pd.to_numeric(cleaned_df["energy_level"], errors="coerce").fillna(NUMERIC_DEFAULTS["energy_level"]).astype(int)
-    if "focus_level" in cleaned_df.columns:
-        cleaned_df["focus_level"] = pd.to_numeric(cleaned_df["focus_level"], errors="coerce").fillna(NUMERIC_DEFAULTS["focus_level"]).astype(int)
-    if "intent" in cleaned_df.columns:
-        cleaned_df["intent"] = cleaned_df["intent"].fillna(CATEGORICAL_DEFAULTS["intent"]).astype(str)
-    if "difficulty" in cleaned_df.columns:
-        cleaned_df["difficulty"] = pd.to_numeric(cleaned_df["difficulty"], errors="coerce").fillna(NUMERIC_DEFAULTS["difficulty"]).astype(int)
+        task_names = cleaned_df["task"] if _holds_only_strings(cleaned_df["task"]) else cleaned_df["task"].astype(str)
+        cleaned_df["task"] = task_names.str.lower().str.strip()
+
+    # Fill NaNs and convert types for every present column in one fillna and one astype call
+    # These defaults are applied if columns contain NaNs after loading
+    cleaned_df.fillna({col: value for col, value in CLEAN_FILL_VALUES.items() if col in cleaned_df.columns}, inplace=True)
+    # astype copies even when nothing changes, so only columns not already of the target type are cast
+    needs_cast = {
+        col: dtype for col, dtype in CLEAN_DTYPES.items()
+        if col in cleaned_df.columns and not (
+            _holds_only_strings(cleaned_df[col]) if dtype is str else cleaned_df[col].dtype == np.dtype(dtype)
+        )
+    }
+    if needs_cast:
+        cleaned_df = cleaned_df.astype(needs_cast, copy=False)
+
     if "tags" in cleaned_df.columns:
-        # Convert comma-separated string from CSV to list, handle NaNs
-        cleaned_df["tags"] = cleaned_df["tags"].fillna("").astype(str).apply(lambda x: [tag.strip() for tag in x.split(TAGS_SEPARATOR) if tag.strip()])
+        # Comma-separated text (CSV) is split; lists (Parquet, already-clean frames) are kept as-is
+        cleaned_df["tags"] = split_tags(cleaned_df["tags"])
     else: # If 'tags' column is completely missing, add it as empty lists
         cleaned_df["tags"] = [[]] * len(cleaned_df)
-
-    if "notes" in cleaned_df.columns:
-        cleaned_df["notes"] = cleaned_df["notes"].fillna(STRING_DEFAULTS["notes"]).astype(str)
-    if "task_type" in cleaned_df.columns:
-        cleaned_df["task_type"] = cleaned_df["task_type"].fillna(CATEGORICAL_DEFAULTS["task_type"]).astype(str)
-
-    if "notes" in cleaned_df.columns:
-        cleaned_df["notes"] = cleaned_df["notes"].fillna("").astype(str)
-    if "task_type" in cleaned_df.columns:
-        cleaned_df["task_type"] = cleaned_df["task_type"].fillna("manual").astype(str)
     
     # Drop rows with missing essential data (re-check after new column handling)
     initial_rows = len(cleaned_df)
@@ -165,26 +399,154 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     # Remove duplicates based on key columns (add new columns to subset if they contribute to uniqueness)
     initial_rows = len(cleaned_df)
     # Assuming date, task, start_time, time_taken are sufficient for uniqueness
-    cleaned_df.drop_duplicates(subset=["date", "task", "start_time", "time_taken"], inplace=True)
+    cleaned_df.drop_duplicates(subset=DUPLICATE_KEY_COLUMNS, inplace=True)
     if len(cleaned_df) < initial_rows:
         print(f"Dropped {initial_rows - len(cleaned_df)} duplicate rows during cleaning.")
     
-    # Recalculate end_time for any rows where it might be missing or incorrect
+    # Recalculate end_time for any rows where it might be missing or incorrect,
+    # computing it on datetime64 arrays and assigning the whole column once
     if "end_time" in cleaned_df.columns and "start_time" in cleaned_df.columns and "time_taken" in cleaned_df.columns:
-        missing_end_time_mask = cleaned_df["end_time"].isna() | (cleaned_df["end_time"] < cleaned_df["start_time"])
-        cleaned_df.loc[missing_end_time_mask, "end_time"] = \
-            cleaned_df.loc[missing_end_time_mask, "start_time"] + \
-            pd.to_timedelta(cleaned_df.loc[missing_end_time_mask, "time_taken"], unit="m")
-
-    # Ensure all datetime columns are indeed datetime objects for further processing
-    if "start_time" in cleaned_df.columns:
-        cleaned_df["start_time"] = pd.to_datetime(cleaned_df["start_time"])
-    if "end_time" in cleaned_df.columns:
-        cleaned_df["end_time"] = pd.to_datetime(cleaned_df["end_time"])
+        start_s = cleaned_df["start_time"].to_numpy(dtype=TASK_DATETIME_DTYPE)
+        end_s = cleaned_df["end_time"].to_numpy(dtype=TASK_DATETIME_DTYPE)
+        duration_s = np.rint(cleaned_df["time_taken"].to_numpy(dtype="float64") * 60).astype("timedelta64[s]")
+        missing_end_time_mask = np.isnat(end_s) | (end_s < start_s)
+        cleaned_df["end_time"] = np.where(missing_end_time_mask, start_s + duration_s, end_s)
+
+    # Store low-cardinality labels as categoricals so groupby, unique and
+    # equality checks work on integer codes instead of Python strings
+    categorize_columns(cleaned_df)
     
     return cleaned_df
 
-def is_overlapping(new_start_datetime: datetime, new_end_datetime: datetime, task_date: date, df: pd.DataFrame) -> bool:
+def _to_task_datetimes(df: pd.DataFrame) -> pd.DataFrame:
+    """Converts the start/end time columns present in df to TASK_DATETIME_DTYPE in place; invalid values become NaT."""
+    for col in TASK_DATETIME_COLUMNS:
+        if col in df.columns and df[col].dtype != TASK_DATETIME_DTYPE:
+            df[col] = pd.to_datetime(df[col], errors="coerce").astype(TASK_DATETIME_DTYPE)
+    return df
+
+def _records_to_frame(records: list) -> pd.DataFrame:
+    """Builds a frame from task dicts made with clean values (see add_manual_task), giving it clean_data's dtypes."""
+    df = _to_task_datetimes(pd.DataFrame.from_records(records, columns=COLUMN_ORDER))
+    return df.astype({col: CLEAN_DTYPES[col] for col in NUMERIC_DEFAULTS})
+
+def _holds_only_strings(values: pd.Series) -> bool:
+    """True when an object column already contains nothing but str values (so astype(str) would be a no-op)."""
+    return values.dtype == object and pd.api.types.infer_dtype(values, skipna=False) == "string"
+
+def categorize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converts the label columns in CATEGORY_DTYPE_COLUMNS to categoricals in place.
+    Columns with a fixed vocabulary in CATEGORICAL_FIELDS list those values first, in
+    their defined order, so every frame shares the same codes; any other values are
+    kept and added after them.
+    
+    Args:
+        df (pd.DataFrame): The DataFrame to convert.
+        
+    Returns:
+        pd.DataFrame: The same DataFrame, for chaining.
+    """
+    for col in CATEGORY_DTYPE_COLUMNS:
+        if col in df.columns:
+            known = CATEGORICAL_FIELDS.get(col, ())
+            extra = sorted((value for value in df[col].dropna().unique() if value not in known), key=str)
+            df[col] = pd.Categorical(df[col], categories=[*known, *extra])
+    return df
+
+def read_import_csv(csv_file, chunksize: int = IMPORT_CHUNK_SIZE) -> pd.DataFrame:
+    """
+    Reads a CSV of tasks in chunks, cleaning each chunk as it is parsed so only
+    one raw chunk is held in memory at a time.
+    
+    Args:
+        csv_file: Path or file-like object (e.g. a Streamlit upload) to read.
+        chunksize (int): Number of rows parsed per chunk.
+        
+    Returns:
+        pd.DataFrame: The cleaned tasks from every chunk.
+    """
+    reader = pd.read_csv(
+        csv_file,
+        chunksize=chunksize,
+        usecols=lambda col: col in COLUMN_ORDER, # Skip columns the app doesn't store
+        dtype=CSV_TEXT_DTYPES
+    )
+    chunks = [clean_data(chunk, inplace=True) for chunk in reader]
+    if not chunks:
+        return pd.DataFrame(columns=COLUMN_ORDER)
+    if len(chunks) == 1:
+        return chunks[0]
+
+    # Chunks can carry different categories, in which case concat falls back to object columns
+    imported = categorize_columns(pd.concat(chunks, ignore_index=True))
+    # clean_data only removes duplicates within a chunk
+    return imported.drop_duplicates(subset=DUPLICATE_KEY_COLUMNS, ignore_index=True)
+
+def append_clean_tasks(df: pd.DataFrame, new_tasks: pd.DataFrame) -> pd.DataFrame:
+    """
+    Appends already-cleaned tasks to an already-cleaned DataFrame. Both sides
+    are clean, so only duplicates across the two need removing; nothing is re-cleaned.
+    
+    Args:
+        df (pd.DataFrame): The current cleaned tasks.
+        new_tasks (pd.DataFrame): Cleaned tasks to append (e.g. from read_import_csv).
+        
+    Returns:
+        pd.DataFrame: The combined tasks, keeping the existing row when both sides hold the same task.
+    """
+    if new_tasks.empty:
+        return df
+    if df.empty:
+        return new_tasks.reset_index(drop=True)
+    # The two sides can carry different categories, in which case concat falls back to object columns
+    combined = categorize_columns(pd.concat([df, new_tasks], ignore_index=True))
+    return combined.drop_duplicates(subset=DUPLICATE_KEY_COLUMNS, ignore_index=True)
+
+def task_keys(df: pd.DataFrame) -> list:
+    """
+    Identifies each task by the DUPLICATE_KEY_COLUMNS values clean_data keeps unique,
+    so a row can be found again in a reloaded frame whatever its index.
+    
+    Args:
+        df (pd.DataFrame): Cleaned tasks.
+        
+    Returns:
+        list: One (date, task, start_time, time_taken) tuple per row, in row order.
+    """
+    return list(zip(*(df[col].tolist() for col in DUPLICATE_KEY_COLUMNS)))
+
+def build_interval_index(df: pd.DataFrame) -> dict:
+    """
+    Groups task time ranges by day so overlap checks only look at one day's tasks.
+    
+    Args:
+        df (pd.DataFrame): The DataFrame containing existing tasks.
+        
+    Returns:
+        dict: Maps each date to a list of (start_ns, end_ns) tuples sorted by start.
+    """
+    if df.empty:
+        return {}
+
+    starts = pd.to_datetime(df["start_time"], errors="coerce")
+    ends = pd.to_datetime(df["end_time"], errors="coerce")
+    days = pd.to_datetime(df["date"], errors="coerce")
+    valid = (starts.notna() & ends.notna() & days.notna()).to_numpy()
+
+    interval_index = {}
+    for day, start_ns, end_ns in zip(
+        days[valid].dt.date,
+        starts[valid].to_numpy(dtype="datetime64[ns]").view("i8").tolist(),
+        ends[valid].to_numpy(dtype="datetime64[ns]").view("i8").tolist()
+    ):
+        interval_index.setdefault(day, []).append((start_ns, end_ns))
+    for intervals in interval_index.values():
+        intervals.sort()
+    return interval_index
+
+def is_overlapping(new_start_datetime: datetime, new_end_datetime: datetime, task_date: date, df: pd.DataFrame,
+                   interval_index: dict = None) -> bool:
     """
     Checks if a new task's timeframe overlaps with any existing tasks on the same day.
     
@@ -193,38 +555,58 @@ def is_overlapping(new_start_datetime: datetime, new_end_datetime: datetime, tas
         new_end_datetime (datetime): The full end datetime of the new task.
         task_date (date): The date of the new task.
         df (pd.DataFrame): The DataFrame containing existing tasks.
+        interval_index (dict, optional): Index from build_interval_index for df. When given,
+            only that day's intervals are checked instead of scanning df.
         
     Returns:
         bool: True if an overlap exists, False otherwise.
     """
-    if df.empty:
-        return False
+    if interval_index is not None:
+        intervals = interval_index.get(task_date, [])
+        new_start_ns = pd.Timestamp(new_start_datetime).value
+        # Only intervals starting before the new end can overlap it; imported
+        # tasks may overlap each other, so check every one of those ends
+        candidates = bisect.bisect_left(intervals, (pd.Timestamp(new_end_datetime).value,))
+        return any(end_ns > new_start_ns for _, end_ns in intervals[:candidates])
 
-    # Filter tasks for the specific date
-    # Ensure 'date' column in df is datetime.date objects for comparison
-    # This conversion is also done in clean_data, but a defensive check here is fine.
-    df_filtered = df[pd.to_datetime(df['date'], errors='coerce').dt.date == task_date].copy()
-
-    if df_filtered.empty:
+    if df.empty:
         return False
 
-    # Ensure 'start_time' and 'end_time' in daily_tasks are datetime objects for comparison
-    df_filtered["start_time"] = pd.to_datetime(df_filtered["start_time"], errors="coerce")
-    df_filtered["end_time"] = pd.to_datetime(df_filtered["end_time"], errors="coerce")
-
-    # Drop rows where start_time or end_time could not be converted
-    df_filtered.dropna(subset=["start_time", "end_time"], inplace=True)
-
-    for _, row in df_filtered.iterrows():
-        existing_start = row["start_time"]
-        existing_end = row["end_time"]
-
-        # Check for overlap: (start1 < end2) and (end1 > start2)
-        # This condition correctly identifies any overlap, including touch points
-        if (new_start_datetime < existing_end) and (new_end_datetime > existing_start):
-            return True
-            
-    return False
+    # Cleaned frames already hold datetimes; only convert columns that don't
+    starts = df["start_time"] if pd.api.types.is_datetime64_any_dtype(df["start_time"]) \
+        else pd.to_datetime(df["start_time"], errors="coerce")
+    ends = df["end_time"] if pd.api.types.is_datetime64_any_dtype(df["end_time"]) \
+        else pd.to_datetime(df["end_time"], errors="coerce")
+    starts = starts.to_numpy(dtype=TASK_DATETIME_DTYPE)
+    ends = ends.to_numpy(dtype=TASK_DATETIME_DTYPE)
+
+    # A task's start_time falls on its date, so the day is selected by a range on the
+    # start times instead of converting every row's date
+    day_start = np.datetime64(task_date, "s")
+    day_end = day_start + np.timedelta64(1, "D")
+
+    # Overlap: (start1 < end2) and (end1 > start2), so touching intervals don't count.
+    # Comparisons against NaT are False, so rows with missing times never match.
+    overlap = (starts >= day_start) & (starts < day_end) \
+        & (starts < np.datetime64(new_end_datetime, "s")) \
+        & (ends > np.datetime64(new_start_datetime, "s"))
+    return bool(overlap.any())
+
+def _validate_row(task: dict):
+    """
+    Checks a single new task against the rules clean_data would otherwise enforce.
+    
+    Args:
+        task (dict): Task values keyed by column name.
+        
+    Raises:
+        Exception: If the duration is not positive or a level is out of range.
+    """
+    if task["time_taken"] <= 0:
+        raise Exception("Task duration must be greater than zero minutes.")
+    for col, (min_val, max_val) in NUMERIC_RANGES.items():
+        if not min_val <= task[col] <= max_val:
+            raise Exception(f"{col.replace('_', ' ').capitalize()} must be between {min_val} and {max_val}.")
 
 def add_manual_task(
     df: pd.DataFrame,
@@ -242,7 +624,9 @@ def add_manual_task(
     difficulty: int = 3,
     tags: list = None, # Expects a list from app.py
     notes: str = "",
-    task_type: str = "manual"
+    task_type: str = "manual",
+    interval_index: dict = None,
+    return_data: bool = True
 ) -> pd.DataFrame:
     """
     Adds a new manual task to the DataFrame after checking for time overlaps.
@@ -265,12 +649,16 @@ def add_manual_task(
         tags (list): List of tags for the task.
         notes (str): Additional notes for the task.
         task_type (str): Type of task (e.g., "manual").
+        interval_index (dict, optional): Index from build_interval_index for df, used for the
+            overlap check and updated in place with the new task.
+        return_data (bool): Build and return the updated DataFrame. Callers that reload
+            afterwards can pass False to skip copying every existing row.
         
     Returns:
-        pd.DataFrame: The updated DataFrame.
+        pd.DataFrame: The updated DataFrame, or None when return_data is False.
         
     Raises:
-        Exception: If the new task overlaps with an existing one.
+        Exception: If the new task overlaps with an existing one or has invalid values.
     """
     # Combine date and time to create full datetime objects for internal logic
     full_start_datetime = datetime.combine(task_date, start_time_obj)
@@ -279,9 +667,12 @@ def add_manual_task(
         full_end_datetime = full_start_datetime + timedelta(minutes=time_taken)
     else:
         full_end_datetime = datetime.combine(task_date, end_time_obj)
+    if full_end_datetime < full_start_datetime:
+        # Same rule clean_data applies: an end before the start is recomputed from the duration
+        full_end_datetime = full_start_datetime + timedelta(minutes=time_taken)
 
     # Check for overlap before adding
-    if is_overlapping(full_start_datetime, full_end_datetime, task_date, df):
+    if is_overlapping(full_start_datetime, full_end_datetime, task_date, df, interval_index):
         raise Exception("Task time overlaps with an existing task on this date. Please adjust the time.")
 
     # Ensure tags is a list, default to empty list if None
@@ -290,11 +681,11 @@ def add_manual_task(
 
     new_task = {
         "date": task_date,
-        "task": task_name.strip(),
+        "task": task_name.lower().strip(), # Same normalization as clean_data
         "start_time": full_start_datetime, # Store as full datetime object internally
         "end_time": full_end_datetime,     # Store as full datetime object internally
         "time_taken": float(time_taken), # Ensure float
-        "category": category,
+        "category": category or CATEGORICAL_DEFAULTS["category"],
         "priority": priority,
         "mood": mood,
         "energy_level": int(energy_level), # Ensure int
@@ -307,17 +698,43 @@ def add_manual_task(
         "completed": False # Default for new tasks
     }
     
-    new_df = pd.DataFrame([new_task])
-    data = pd.concat([df, new_df], ignore_index=True)
-    
-    data = clean_data(data) # Clean data after concatenation to ensure all types are correct
-    save_data(data) # save_data will handle string conversions for CSV
-    
+    _validate_row(new_task)
+
+    # Only the new row is written; stored tasks are left untouched. If the load cache
+    # matched the files before this write it stays valid, and the task is buffered
+    # for the next load_data to merge instead of re-reading and re-cleaning everything
+    global _CACHE_KEY
+    cache_current = _CACHE_KEY is not None and _CACHE_KEY == _data_files_key()
+    _write_pending_row(new_task)
+    if cache_current:
+        _RECORDS_BUFFER.append(new_task)
+        _CACHE_KEY = _data_files_key()
+    else:
+        _invalidate_load_cache()
+    flush_pending()
+
+    if interval_index is not None:
+        bisect.insort(
+            interval_index.setdefault(task_date, []),
+            (pd.Timestamp(full_start_datetime).value, pd.Timestamp(full_end_datetime).value)
+        )
+
+    if not return_data:
+        return None
+
+    # df is already clean and new_task is built with clean types, so the existing
+    # rows are not re-cleaned; only the categoricals concat widens need re-typing
+    new_df = _records_to_frame([new_task])
+    if df.empty:
+        data = new_df
+    else:
+        data = pd.concat([df, new_df], ignore_index=True)
+    categorize_columns(data)
     return data
 
 # Example usage (for testing purposes, not part of the main app flow)
 if __name__ == "__main__":
-    # Ensure data.csv exists for testing
+    # Ensure the data file exists for testing
     if not os.path.exists(DATA_FILE):
         initial_data = pd.DataFrame(columns=COLUMN_ORDER)
         save_data(initial_data)
@@ -3,10 +3,13 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta, date
+from functools import lru_cache
+import hashlib
 import logging
+import time
 
 # Local modules
-from data_constants import NUMERIC_DEFAULTS, CATEGORICAL_DEFAULTS, STRING_DEFAULTS
+from data_constants import NUMERIC_DEFAULTS, CATEGORICAL_DEFAULTS, STRING_DEFAULTS, DATE_FORMAT, DATETIME_FORMAT
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +21,14 @@ Handles date/time conversions, data cleaning, and preparation across the applica
 
 # ==================== DATE/TIME UTILITIES ====================
 
-def prepare_datetime_columns(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+# Formats the app writes its own dates and times in. Parsing with an explicit format
+# takes pandas' C strptime path; values in any other format fall back to inference.
+DATETIME_COLUMN_FORMATS = {"date": DATE_FORMAT, "start_time": DATETIME_FORMAT, "end_time": DATETIME_FORMAT}
+
+# Names for dayofweek values 0-6, so day names are an array lookup instead of formatting
+DAY_NAMES = np.array(["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"], dtype=object)
+
+def prepare_datetime_columns(df: pd.DataFrame, copy: bool = True, time_parts: bool = False) -> pd.DataFrame:
     """
     Standardized date/time conversion for all DataFrame operations.
     Converts object dtype date/time columns to proper datetime types.
@@ -26,6 +36,8 @@ def prepare_datetime_columns(df: pd.DataFrame, copy: bool = True) -> pd.DataFram
     Args:
         df: Input DataFrame
         copy: Whether to copy the DataFrame before modifying
+        time_parts: Also add int8 "hour" and "dow" (0 = Monday) columns from start_time,
+                    -1 where start_time is missing, so callers need no further .dt calls
         
     Returns:
         DataFrame with properly formatted date/time columns
@@ -35,19 +47,103 @@ def prepare_datetime_columns(df: pd.DataFrame, copy: bool = True) -> pd.DataFram
     
     result = df.copy() if copy else df
     
-    # Convert date column
-    if "date" in result.columns and pd.api.types.is_object_dtype(result["date"]):
-        result["date"] = pd.to_datetime(result["date"], errors="coerce").dt.date
+    _convert_datetime_columns(result)
+    
+    # Hour and weekday of start_time, computed once for every chart that needs them
+    if time_parts and "start_time" in result.columns:
+        has_start = result["start_time"].notna().to_numpy()
+        start_times = result["start_time"][has_start].dt
+        hour = np.full(len(result), -1, dtype=np.int8)
+        dow = np.full(len(result), -1, dtype=np.int8)
+        hour[has_start] = start_times.hour.to_numpy(dtype=np.int8)
+        dow[has_start] = start_times.dayofweek.to_numpy(dtype=np.int8)
+        result["hour"] = hour
+        result["dow"] = dow
+    
+    return result
+
+
+def _convert_datetime_columns(result: pd.DataFrame) -> None:
+    """
+    Parse the object dtype date/start_time/end_time columns of result in place.
+    Columns that are already converted (datetime64 times, a date column holding only
+    date objects) are left as they are, so a frame prepared earlier is not parsed again.
+    """
+    # Convert date column (stored as Python date objects once converted)
+    if ("date" in result.columns and pd.api.types.is_object_dtype(result["date"])
+            and pd.api.types.infer_dtype(result["date"], skipna=True) != "date"):
+        result["date"] = _cached_to_datetime(result["date"], as_date=True)
     
     # Convert start_time column
     if "start_time" in result.columns and pd.api.types.is_object_dtype(result["start_time"]):
-        result["start_time"] = pd.to_datetime(result["start_time"], errors="coerce")
+        result["start_time"] = _cached_to_datetime(result["start_time"])
     
     # Convert end_time column
     if "end_time" in result.columns and pd.api.types.is_object_dtype(result["end_time"]):
-        result["end_time"] = pd.to_datetime(result["end_time"], errors="coerce")
+        result["end_time"] = _cached_to_datetime(result["end_time"])
+
+
+def _cached_to_datetime(values: pd.Series, as_date: bool = False) -> pd.Series:
+    """
+    pd.to_datetime(values, errors="coerce") that parses each distinct value once.
+    Task dates and clock times repeat heavily, so parsing only the uniques and
+    mapping them back is much cheaper than parsing every row.
     
-    return result
+    Args:
+        values: Object column of dates/datetimes (text or Python objects)
+        as_date: Return Python date objects instead of datetimes
+        
+    Returns:
+        Series with the same index holding the parsed values
+    """
+    uniques = pd.unique(values.to_numpy())
+    parsed = _parse_datetimes(pd.Series(uniques, dtype=object), values.name)
+    if as_date:
+        # Only the distinct values become Python date objects
+        parsed = parsed.dt.date
+    return values.map(dict(zip(uniques, parsed)))
+
+
+def _parse_datetimes(values: pd.Series, column: str = None) -> pd.Series:
+    """
+    pd.to_datetime(values, errors="coerce") using the app's format for the named column.
+    Only values that don't match that format are parsed again with format inference.
+    
+    Args:
+        values: Column of dates/datetimes (text or Python objects)
+        column: Column name used to look up the format in DATETIME_COLUMN_FORMATS
+        
+    Returns:
+        datetime64 Series with the same index; unparseable values are NaT
+    """
+    fmt = DATETIME_COLUMN_FORMATS.get(column)
+    if fmt is None:
+        return pd.to_datetime(values, errors="coerce")
+    parsed = pd.to_datetime(values, format=fmt, errors="coerce", cache=True)
+    retry = parsed.isna() & values.notna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(values[retry], errors="coerce")
+    return parsed
+
+
+def _as_datetime_series(values: pd.Series, column: str = None) -> pd.Series:
+    """
+    Return values as datetime64 without parsing more than needed: datetime columns
+    (any unit or timezone) are returned as they are, object columns (text or Python
+    date objects) parse each distinct value once, and anything else is parsed directly.
+    
+    Args:
+        values: Column to convert
+        column: Column name used to look up the format in DATETIME_COLUMN_FORMATS
+        
+    Returns:
+        datetime64 Series with the same index
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    if pd.api.types.is_object_dtype(values):
+        return _cached_to_datetime(values.rename(column))
+    return _parse_datetimes(values, column)
 
 
 def extract_hour_from_datetime(df: pd.DataFrame, time_column: str = "start_time") -> pd.Series:
@@ -59,15 +155,26 @@ def extract_hour_from_datetime(df: pd.DataFrame, time_column: str = "start_time"
         time_column: Name of the datetime column
         
     Returns:
-        Series with hour values (0-23)
+        Series with hour values (0-23) as int8, or float with NaN where the time is missing
     """
     if time_column not in df.columns:
         return pd.Series(dtype=int)
     
     try:
         if not pd.api.types.is_datetime64_any_dtype(df[time_column]):
-            df[time_column] = pd.to_datetime(df[time_column], errors="coerce")
-        return df[time_column].dt.hour
+            df[time_column] = _as_datetime_series(df[time_column], time_column)
+        times = df[time_column]
+        if not isinstance(times.dtype, np.dtype):
+            return times.dt.hour  # Timezone-aware: the accessor gives local hours
+        
+        # Hours since the epoch, modulo 24, straight from the datetime64 buffer (any unit)
+        values = times.to_numpy()
+        hours = (values.astype("datetime64[h]").view("i8") % 24).astype(np.int8)
+        missing = np.isnat(values)
+        if missing.any():
+            # Same as .dt.hour: missing times come back as NaN
+            return pd.Series(np.where(missing, np.nan, hours), index=times.index, name=times.name)
+        return pd.Series(hours, index=times.index, name=times.name)
     except Exception as e:
         logger.error(f"Error extracting hour from {time_column}: {e}")
         return pd.Series(dtype=int)
@@ -90,15 +197,23 @@ def extract_date_components(df: pd.DataFrame, date_column: str = "date") -> dict
     result = {}
     try:
         # Convert to datetime if needed
-        if not pd.api.types.is_datetime64_any_dtype(df[date_column]):
-            temp = pd.to_datetime(df[date_column], errors="coerce")
-        else:
-            temp = df[date_column]
+        temp = _as_datetime_series(df[date_column], date_column)
         
-        result["hour"] = temp.dt.hour
-        result["day_of_week"] = temp.dt.dayofweek
-        result["day_name"] = temp.dt.day_name()
-        result["week_start"] = temp - pd.to_timedelta(temp.dt.dayofweek, unit='d')
+        # Dates repeat across tasks, so decompose each distinct value once and map back by code
+        codes, uniques = pd.factorize(temp, use_na_sentinel=False)
+        uniques = pd.DatetimeIndex(uniques)
+        day_of_week = uniques.dayofweek
+        missing = uniques.isna()
+        day_names = DAY_NAMES[np.where(missing, 0, day_of_week).astype(int)]
+        day_names[missing] = np.nan
+        components = {
+            "hour": uniques.hour,
+            "day_of_week": day_of_week,
+            "day_name": pd.Index(day_names),
+            "week_start": uniques - pd.to_timedelta(day_of_week, unit='d')
+        }
+        for name, values in components.items():
+            result[name] = pd.Series(values.take(codes), index=temp.index, name=temp.name)
         
     except Exception as e:
         logger.error(f"Error extracting date components: {e}")
@@ -108,7 +223,7 @@ def extract_date_components(df: pd.DataFrame, date_column: str = "date") -> dict
 
 # ==================== DATA CLEANING UTILITIES ====================
 
-def ensure_numeric_columns(df: pd.DataFrame, column_mapping: dict = None) -> pd.DataFrame:
+def ensure_numeric_columns(df: pd.DataFrame, column_mapping: dict = None, copy: bool = True) -> pd.DataFrame:
     """
     Ensure numeric columns have correct data types with default fill values.
     
@@ -116,6 +231,7 @@ def ensure_numeric_columns(df: pd.DataFrame, column_mapping: dict = None) -> pd.
         df: Input DataFrame
         column_mapping: Dict mapping column names to (dtype, default_value) tuples
                        If None, uses standard numeric columns
+        copy: Whether to copy the DataFrame before modifying
         
     Returns:
         DataFrame with properly typed numeric columns
@@ -123,24 +239,33 @@ def ensure_numeric_columns(df: pd.DataFrame, column_mapping: dict = None) -> pd.
     if df.empty:
         return df
     
-    result = df.copy()
+    result = df.copy() if copy else df
     
     if column_mapping is None:
         column_mapping = {
-            "time_taken": (float, NUMERIC_DEFAULTS["time_taken"]),
-            "energy_level": (int, NUMERIC_DEFAULTS["energy_level"]),
-            "focus_level": (int, NUMERIC_DEFAULTS["focus_level"]),
-            "difficulty": (int, NUMERIC_DEFAULTS["difficulty"])
+            "time_taken": (np.float32, NUMERIC_DEFAULTS["time_taken"]),
+            "energy_level": (np.int8, NUMERIC_DEFAULTS["energy_level"]),
+            "focus_level": (np.int8, NUMERIC_DEFAULTS["focus_level"]),
+            "difficulty": (np.int8, NUMERIC_DEFAULTS["difficulty"])
         }
     
-    for col, (dtype, default_val) in column_mapping.items():
-        if col in result.columns:
-            result[col] = pd.to_numeric(result[col], errors="coerce").fillna(default_val).astype(dtype)
+    # Parse, fill and cast every present column together instead of one column at a time
+    cols = [col for col in column_mapping if col in result.columns]
+    if cols:
+        numeric = result[cols].apply(pd.to_numeric, errors="coerce")
+        # Values that don't fit a narrow integer type would wrap around, so they get the default too
+        for col in cols:
+            dtype = np.dtype(column_mapping[col][0])
+            if dtype.kind in "iu":
+                limits = np.iinfo(dtype)
+                numeric[col] = numeric[col].where(numeric[col].between(limits.min, limits.max))
+        result[cols] = numeric.fillna({col: column_mapping[col][1] for col in cols}) \
+            .astype({col: column_mapping[col][0] for col in cols})
     
     return result
 
 
-def ensure_categorical_columns(df: pd.DataFrame, column_defaults: dict = None) -> pd.DataFrame:
+def ensure_categorical_columns(df: pd.DataFrame, column_defaults: dict = None, copy: bool = True) -> pd.DataFrame:
     """
     Ensure categorical columns are strings with proper default values.
     
@@ -148,6 +273,7 @@ def ensure_categorical_columns(df: pd.DataFrame, column_defaults: dict = None) -
         df: Input DataFrame
         column_defaults: Dict mapping column names to default string values
                         If None, uses standard categorical columns
+        copy: Whether to copy the DataFrame before modifying
         
     Returns:
         DataFrame with properly typed categorical columns
@@ -155,7 +281,7 @@ def ensure_categorical_columns(df: pd.DataFrame, column_defaults: dict = None) -
     if df.empty:
         return df
     
-    result = df.copy()
+    result = df.copy() if copy else df
     
     if column_defaults is None:
         column_defaults = {
@@ -173,7 +299,7 @@ def ensure_categorical_columns(df: pd.DataFrame, column_defaults: dict = None) -
     return result
 
 
-def clean_numeric_range(df: pd.DataFrame, column: str, min_val: int, max_val: int) -> pd.DataFrame:
+def clean_numeric_range(df: pd.DataFrame, column: str, min_val: int, max_val: int, copy: bool = True) -> pd.DataFrame:
     """
     Clip numeric column values to specified range.
     
@@ -182,6 +308,7 @@ def clean_numeric_range(df: pd.DataFrame, column: str, min_val: int, max_val: in
         column: Column name
         min_val: Minimum allowed value
         max_val: Maximum allowed value
+        copy: Whether to copy the DataFrame before modifying
         
     Returns:
         DataFrame with clipped values
@@ -189,11 +316,35 @@ def clean_numeric_range(df: pd.DataFrame, column: str, min_val: int, max_val: in
     if df.empty or column not in df.columns:
         return df
     
-    result = df.copy()
+    result = df.copy() if copy else df
+    values = result[column].values
+    if isinstance(values, np.ndarray) and values.dtype.kind in "iuf":
+        # Already numeric: clip the existing buffer in place instead of building a new column
+        try:
+            np.clip(values, min_val, max_val, out=values)
+            return result
+        except (TypeError, ValueError):
+            pass  # Bounds that don't fit the dtype, or a read-only buffer
     result[column] = pd.to_numeric(result[column], errors="coerce").clip(min_val, max_val)
     return result
 
 
+def drop_unused_categories(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Remove categories that no row uses from every categorical column, in place.
+    plotly express looks up a group for each category, so unused ones break its charts.
+    
+    Args:
+        df: Input DataFrame (typically a filtered copy)
+        
+    Returns:
+        The same DataFrame, for chaining
+    """
+    for col in df.select_dtypes("category").columns:
+        df[col] = df[col].cat.remove_unused_categories()
+    return df
+
+
 # ==================== FILTERING UTILITIES ====================
 
 def filter_by_date_range(df: pd.DataFrame, start_date: date = None, end_date: date = None,
@@ -213,21 +364,21 @@ def filter_by_date_range(df: pd.DataFrame, start_date: date = None, end_date: da
     if df.empty or date_column not in df.columns:
         return df
     
-    result = df.copy()
-    
-    # Convert date column if needed
-    if not pd.api.types.is_datetime64_any_dtype(result[date_column]):
-        result[date_column] = pd.to_datetime(result[date_column], errors="coerce").dt.date
-    else:
-        result[date_column] = result[date_column].dt.date
+    # Compare raw datetime64 values against day bounds rather than Python date objects;
+    # the end day is made exclusive so times within it still count without normalizing
+    dates = _as_datetime_series(df[date_column], date_column)
+    values = dates.to_numpy()
     
     if end_date is None:
         end_date = date.today()
     
+    mask = values < (pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1)).to_datetime64()
     if start_date is not None:
-        result = result[result[date_column] >= start_date]
+        mask &= values >= pd.Timestamp(start_date).normalize().to_datetime64()
     
-    result = result[result[date_column] <= end_date]
+    # Only the kept rows get their dates converted to Python date objects
+    result = df.loc[mask].copy()
+    result[date_column] = dates[mask].dt.date
     
     return result
 
@@ -244,8 +395,15 @@ def filter_by_days_back(df: pd.DataFrame, days: int = 7, date_column: str = "dat
     Returns:
         Filtered DataFrame
     """
-    cutoff_date = datetime.now().date() - timedelta(days=days-1)
-    return filter_by_date_range(df, start_date=cutoff_date, date_column=date_column)
+    today = _today(round(time.time() / 60))
+    return filter_by_date_range(df, start_date=today - timedelta(days=days-1), end_date=today,
+                                date_column=date_column)
+
+
+@lru_cache(maxsize=32)
+def _today(ttl_hash: int) -> date:
+    """Today's date, looked up at most once per ttl_hash (one per minute as filter_by_days_back calls it)."""
+    return datetime.now().date()
 
 
 # ==================== TAGS UTILITIES ====================
@@ -257,6 +415,50 @@ def parse_tags_from_string(tags_str: str) -> list:
     return [t.strip() for t in tags_str.split(',') if t.strip()]
 
 
+def parse_tags(value) -> list:
+    """Normalize tags to a list of stripped strings, from comma-separated text or a list/array of tags."""
+    if isinstance(value, str):
+        return parse_tags_from_string(value)
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [str(t).strip() for t in value if t is not None and str(t).strip()]
+    return []
+
+
+def split_tags(tags: pd.Series) -> pd.Series:
+    """
+    Column-wide parse_tags. Lists are kept as they are (stored and form-entered tags
+    are already clean), so only text and other values go through parse_tags.
+    
+    Args:
+        tags: Tags column holding text, lists, or missing values
+        
+    Returns:
+        Series of tag lists with the same index
+    """
+    if pd.api.types.infer_dtype(tags, skipna=True) in ("string", "empty"):
+        # Text only (e.g. read from CSV): tag strings repeat, so parse each distinct one once
+        return parse_tags_batch(tags)
+    return pd.Series(
+        [value if type(value) is list else parse_tags(value) for value in tags],
+        index=tags.index, dtype=object
+    )
+
+
+def parse_tags_batch(tags: pd.Series) -> pd.Series:
+    """
+    Column-wide parse_tags for text values that parses each distinct value once.
+    
+    Args:
+        tags: Tags column of comma-separated text or missing values
+        
+    Returns:
+        Series of tag lists with the same index; every row gets its own list
+    """
+    codes, uniques = pd.factorize(tags, use_na_sentinel=False)
+    parsed = [parse_tags(value) for value in uniques]
+    return pd.Series([list(parsed[code]) for code in codes], index=tags.index, dtype=object)
+
+
 def convert_tags_to_string(tags: list) -> str:
     """Convert tags list to comma-separated string."""
     if not tags or not isinstance(tags, list):
@@ -264,13 +466,15 @@ def convert_tags_to_string(tags: list) -> str:
     return ','.join(str(t) for t in tags)
 
 
-def normalize_task_names(df: pd.DataFrame, task_column: str = "task") -> pd.DataFrame:
+def normalize_task_names(df: pd.DataFrame, task_column: str = "task", copy: bool = True) -> pd.DataFrame:
     """
     Normalize task names: lowercase and strip whitespace.
+    The result is an Arrow-backed string column; missing names stay missing.
     
     Args:
         df: Input DataFrame
         task_column: Name of task column
+        copy: Whether to copy the DataFrame before modifying
         
     Returns:
         DataFrame with normalized task names
@@ -278,6 +482,32 @@ def normalize_task_names(df: pd.DataFrame, task_column: str = "task") -> pd.Data
     if df.empty or task_column not in df.columns:
         return df
     
-    result = df.copy()
-    result[task_column] = result[task_column].astype(str).str.lower().str.strip()
+    result = df.copy() if copy else df
+    # Arrow-backed strings run lower/strip as C++ kernels instead of per-object Python calls
+    result[task_column] = result[task_column].astype("string[pyarrow]").str.lower().str.strip()
     return result
+
+
+# ==================== CACHING UTILITIES ====================
+
+def dataframe_fingerprint(df: pd.DataFrame, columns: list = None) -> str:
+    """
+    Compute a content hash of a DataFrame for use as a cache key across reruns.
+
+    Args:
+        df: Input DataFrame
+        columns: Columns to include (defaults to all); missing columns are ignored
+
+    Returns:
+        Hex digest that changes whenever the selected values or index change
+    """
+    subset = df if columns is None else df[[col for col in columns if col in df.columns]]
+
+    # Lists (tags) are unhashable, so hash their string form instead
+    if "tags" in subset.columns:
+        subset = subset.assign(tags=subset["tags"].map(
+            lambda x: ','.join(map(str, x)) if isinstance(x, list) else str(x)
+        ))
+
+    hashed = pd.util.hash_pandas_object(subset, index=True)
+    return hashlib.sha1(hashed.values.tobytes()).hexdigest()
@@ -3,15 +3,17 @@
 import pandas as pd
 import numpy as np
 
-# Machine Learning
-from sklearn.preprocessing import LabelEncoder, OneHotEncoder
-from sklearn.feature_extraction.text import TfidfVectorizer
+# Machine Learning (sklearn is imported where it is used, so importing this module stays cheap)
+from joblib import Parallel, delayed
+from scipy import sparse
 
 # Logging
 import logging
 
 logger = logging.getLogger(__name__)
 
+PARALLEL_ENCODE_MIN_ROWS = 100_000  # Below this, thread start-up costs more than encoding columns serially
+
 # ==================== MODULE DESCRIPTION ====================
 """
 Consolidated encoding utilities for categorical and text feature engineering.
@@ -23,7 +25,7 @@ class CategoricalEncoder:
     """Handles encoding of categorical columns across the application."""
     
     def __init__(self):
-        self.encoders = {}
+        self.encoders = {}  # column -> CategoricalDtype whose category positions are the codes
         self.categories_known = {}
     
     def fit_categorical_column(self, df: pd.DataFrame, column: str, handle_unknown: str = 'unknown') -> None:
@@ -40,14 +42,12 @@ class CategoricalEncoder:
             return
         
         try:
-            values = df[column].fillna(handle_unknown).astype(str).unique().tolist()
+            values = df[column].astype(object).fillna(handle_unknown).astype(str).unique().tolist()
             if handle_unknown not in values:
                 values.append(handle_unknown)
             
-            le = LabelEncoder()
-            le.fit(values)
-            
-            self.encoders[column] = le
+            # Sorted categories give the same codes LabelEncoder would
+            self.encoders[column] = pd.CategoricalDtype(categories=sorted(values))
             self.categories_known[column] = set(values)
             logger.info(f"Fitted encoder for {column} with {len(values)} categories")
             
@@ -76,24 +76,68 @@ class CategoricalEncoder:
         
         target_col = target_column or f"{column}_encoded"
         result = df.copy()
-        
+        result[target_col] = self._encode_codes(result[column], column)
+        return result
+    
+    def _encode_codes(self, values: pd.Series, column: str):
+        """Codes for a fitted column's values, or 0 if encoding fails."""
         try:
-            le = self.encoders[column]
+            dtype = self.encoders[column]
             
-            # Handle unknown values
-            values = result[column].fillna('unknown').astype(str)
-            values = values.apply(
-                lambda x: x if x in self.categories_known.get(column, set()) else 'unknown'
-            )
+            # Category codes come from a hash lookup; unseen values (-1) get the code of 'unknown'
+            values = values.astype(object).fillna('unknown').astype(str)
+            codes = pd.Categorical(values, dtype=dtype).codes.astype(np.int32)
+            unseen = codes == -1
+            if unseen.any():
+                codes[unseen] = dtype.categories.get_loc('unknown')
             
-            result[target_col] = le.transform(values)
-            logger.debug(f"Encoded {column} to {target_col}")
+            logger.debug(f"Encoded {column}")
+            return codes
             
         except Exception as e:
             logger.error(f"Error encoding {column}: {e}")
-            result[target_col] = 0
+            return 0
+    
+    def encode_value(self, column: str, value) -> int:
+        """Code for a single value of a fitted column; unseen values get the code of 'unknown'."""
+        categories = self.encoders[column].categories
+        code = categories.get_indexer([str(value)])[0]
+        return int(code) if code != -1 else categories.get_loc('unknown')
+    
+    def fit_transform_values(self, column: str, values: pd.Series, handle_unknown: str = 'unknown') -> np.ndarray:
+        """
+        Fit the encoder for a column and return the codes of its values from one hash pass.
         
-        return result
+        Args:
+            column: Column name the encoder is stored under
+            values: The column's values
+            handle_unknown: Default value for missing and unknown categories
+            
+        Returns:
+            int32 codes, the same as fit_categorical_column followed by encode_column
+        """
+        values = values.astype(object).fillna(handle_unknown).astype(str)
+        codes, uniques = pd.factorize(values)
+        
+        # Sorted categories give the same codes LabelEncoder would; each row's code is
+        # then a lookup of its factorized position rather than a second hash pass
+        known = set(uniques) | {handle_unknown}
+        self.encoders[column] = pd.CategoricalDtype(categories=sorted(known))
+        self.categories_known[column] = known
+        logger.info(f"Fitted encoder for {column} with {len(known)} categories")
+        return self.encoders[column].categories.get_indexer(uniques).astype(np.int32)[codes]
+    
+    def encode_values(self, column: str, values) -> np.ndarray:
+        """Codes for a sequence of values of a fitted column; missing and unseen values get the code of 'unknown'."""
+        # A direct index lookup: for the handful of values a prediction needs, building a
+        # Series and Categorical costs far more than the hashing itself
+        categories = self.encoders[column].categories
+        # is_scalar guard: pd.isna of a list-like value is an array, which has no truth value
+        codes = categories.get_indexer([
+            'unknown' if pd.api.types.is_scalar(value) and pd.isna(value) else str(value) for value in values
+        ])
+        codes[codes == -1] = categories.get_loc('unknown')
+        return codes.astype(np.int32)
     
     def fit_and_encode(self, df: pd.DataFrame, column: str, target_column: str = None) -> pd.DataFrame:
         """Fit encoder and encode column in one step."""
@@ -103,19 +147,51 @@ class CategoricalEncoder:
     def encode_multiple_columns(self, df: pd.DataFrame, columns: list) -> pd.DataFrame:
         """Encode multiple categorical columns at once."""
         result = df.copy()
+        to_encode = []
         for col in columns:
-            result = self.encode_column(result, col)
+            if col not in self.encoders:
+                logger.warning(f"No encoder found for {col}. Fit the encoder first.")
+            elif col not in result.columns:
+                logger.warning(f"Column {col} not found in DataFrame")
+            else:
+                to_encode.append(col)
+        
+        # Columns are independent, so large frames encode them on parallel threads
+        # (pandas' hash lookups release the GIL); the result is copied only once
+        n_jobs = -1 if len(result) >= PARALLEL_ENCODE_MIN_ROWS else 1
+        codes = Parallel(n_jobs=n_jobs, backend='threading')(
+            delayed(self._encode_codes)(result[col], col) for col in to_encode
+        )
+        for col, col_codes in zip(to_encode, codes):
+            result[f"{col}_encoded"] = col_codes
         return result
 
 
 class TextFeatureExtractor:
-    """Handles TF-IDF and text feature extraction."""
+    """
+    Handles TF-IDF text feature extraction. Terms are hashed into a fixed number
+    of columns, so no vocabulary has to be built or stored; fitting only learns
+    the IDF weights and which columns occur in at least min_df documents.
+    """
+    
+    N_FEATURES = 2 ** 18
     
     def __init__(self, stop_words: str = 'english', min_df: int = 2, ngram_range: tuple = (1, 2)):
-        self.vectorizer = None
+        from sklearn.feature_extraction.text import HashingVectorizer
+        
         self.stop_words = stop_words
         self.min_df = min_df
         self.ngram_range = ngram_range
+        # Raw term counts; the TF-IDF weighting and L2 norm are applied by self.tfidf
+        self.vectorizer = HashingVectorizer(
+            n_features=self.N_FEATURES,
+            alternate_sign=False,
+            ngram_range=self.ngram_range,
+            stop_words=self.stop_words,
+            norm=None
+        )
+        self.tfidf = None
+        self.kept_columns = None  # 1.0 for hashed columns seen in at least min_df documents
     
     def create_combined_text_features(self, df: pd.DataFrame,
                                      text_columns: list = None) -> pd.DataFrame:
@@ -137,26 +213,27 @@ class TextFeatureExtractor:
         
         result = df.copy()
         
-        # Initialize combined_text
-        result['combined_text'] = ''
-        
+        col_texts = []
         for col in text_columns:
             if col not in result.columns:
                 continue
             
-            # Handle lists (like tags) and strings
-            col_text = result[col].apply(
-                lambda x: ' '.join(x) if isinstance(x, list) else str(x)
-            ).fillna('')
-            
-            result['combined_text'] += ' ' + col_text
+            # Join lists (like tags); columns that hold only strings skip the per-row pass
+            values = result[col].astype(object)
+            if pd.api.types.infer_dtype(values, skipna=True) not in ('string', 'empty'):
+                values = values.map(lambda x: ' '.join(x) if isinstance(x, list) else x)
+            col_texts.append(values.fillna('').astype(str))
         
-        result['combined_text'] = result['combined_text'].str.strip()
+        # Concatenate every column in one pass instead of growing the text column by column
+        if col_texts:
+            result['combined_text'] = col_texts[0].str.cat(col_texts[1:], sep=' ').str.strip()
+        else:
+            result['combined_text'] = ''
         return result
     
     def fit_tfidf(self, df: pd.DataFrame, text_column: str = 'combined_text') -> 'TextFeatureExtractor':
         """
-        Fit TF-IDF vectorizer on text column.
+        Fit the IDF weights on a text column.
         
         Args:
             df: Input DataFrame
@@ -170,39 +247,48 @@ class TextFeatureExtractor:
             return self
         
         try:
-            self.vectorizer = TfidfVectorizer(
-                stop_words=self.stop_words,
-                min_df=self.min_df,
-                ngram_range=self.ngram_range
-            )
-            self.vectorizer.fit(df[text_column].fillna(''))
-            logger.info(f"Fitted TF-IDF vectorizer with {len(self.vectorizer.vocabulary_)} features")
+            from sklearn.feature_extraction.text import TfidfTransformer
+            
+            counts = self.vectorizer.transform(df[text_column].fillna(''))
+            # Document frequency per hashed column, for the same min_df pruning TfidfVectorizer does
+            doc_freq = np.bincount(counts.indices, minlength=self.N_FEATURES)
+            self.kept_columns = (doc_freq >= self.min_df).astype(np.float64)
+            self.tfidf = TfidfTransformer().fit(self._prune(counts))
+            logger.info(f"Fitted TF-IDF weights for {int(self.kept_columns.sum())} hashed features")
             
         except Exception as e:
             logger.error(f"Error fitting TF-IDF: {e}")
         
         return self
     
-    def transform_text(self, texts) -> np.ndarray:
+    def _prune(self, counts: sparse.csr_matrix) -> sparse.csr_matrix:
+        """Drop the counts of hashed columns that fell below min_df when fitting."""
+        counts.data *= self.kept_columns[counts.indices]
+        counts.eliminate_zeros()
+        return counts
+    
+    def transform_text(self, texts, dense: bool = False) -> sparse.csr_matrix:
         """
         Transform texts to TF-IDF features.
         
         Args:
             texts: Text or list of texts to transform
+            dense: Convert the result to a dense array, for callers that need one
             
         Returns:
-            Sparse matrix or dense array of TF-IDF features
+            Sparse CSR matrix of TF-IDF features (dense array if dense=True)
         """
-        if self.vectorizer is None:
+        if self.tfidf is None:
             logger.error("Vectorizer not fitted. Call fit_tfidf first.")
             return np.array([])
         
         try:
-            result = self.vectorizer.transform(
+            counts = self.vectorizer.transform(
                 [texts] if isinstance(texts, str) else texts
             )
+            result = self.tfidf.transform(self._prune(counts))
             # Convert to dense array
-            if hasattr(result, 'toarray'):
+            if dense and hasattr(result, 'toarray'):
                 return result.toarray()
             return result
             
@@ -225,7 +311,8 @@ def prepare_ml_features(df: pd.DataFrame,
         text_cols: List of text column names for TF-IDF
         
     Returns:
-        Tuple of (feature_matrix, encoders, vectorizer)
+        Tuple of (feature_matrix, encoders, vectorizer); the feature matrix is a
+        float32 CSR matrix so the TF-IDF block never has to be densified
     """
     if df.empty:
         return np.array([]), {}, None
@@ -239,7 +326,7 @@ def prepare_ml_features(df: pd.DataFrame,
     
     result_df = df.copy()
     encoders = {}
-    features_list = []
+    feature_columns = []
     
     # Encode categorical features
     cat_encoder = CategoricalEncoder()
@@ -247,28 +334,32 @@ def prepare_ml_features(df: pd.DataFrame,
         if col in result_df.columns:
             result_df = cat_encoder.fit_and_encode(result_df, col)
             encoders[col] = cat_encoder.encoders.get(col)
-            features_list.append(result_df[[f"{col}_encoded"]])
+            feature_columns.append(f"{col}_encoded")
     
     # Add numeric features
-    for col in numeric_cols:
-        if col in result_df.columns:
-            features_list.append(result_df[[col]])
+    feature_columns += [col for col in numeric_cols if col in result_df.columns]
+    
+    features_list = []
+    if feature_columns:
+        # Encoded and numeric columns form one small dense block, written column by column
+        # into a preallocated buffer instead of selecting a sub-frame and converting it
+        dense_block = np.empty((len(result_df), len(feature_columns)), dtype=np.float32, order='F')
+        for i, col in enumerate(feature_columns):
+            np.copyto(dense_block[:, i], result_df[col].to_numpy(), casting='unsafe')
+        features_list.append(sparse.csr_matrix(dense_block))
     
     # Extract text features
     text_extractor = TextFeatureExtractor()
     result_df = text_extractor.create_combined_text_features(result_df, text_cols)
-    result_df = text_extractor.fit_tfidf(result_df)
+    text_extractor.fit_tfidf(result_df)
     
     text_features = text_extractor.transform_text(result_df['combined_text'].fillna('').values)
-    if len(text_features) > 0:
+    if text_features.shape[0] > 0:
         features_list.append(text_features)
     
-    # Combine all features
+    # Combine all features, keeping the text block sparse
     if features_list:
-        combined_features = np.hstack([
-            f.values if isinstance(f, pd.DataFrame) else f 
-            for f in features_list
-        ])
+        combined_features = sparse.hstack(features_list, format='csr', dtype=np.float32)
     else:
         combined_features = np.array([])
     
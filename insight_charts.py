@@ -12,8 +12,12 @@ import plotly.express as px
 import plotly.graph_objects as go
 
 # Local modules
-from data_constants import HEATMAP_COLORS, PRIORITY_COLORS
-from data_preprocessing import prepare_datetime_columns, extract_hour_from_datetime
+from data_constants import HEATMAP_COLORS, PRIORITY_COLORS, VALID_PRIORITY_VALUES
+from data_preprocessing import (
+    prepare_datetime_columns, extract_hour_from_datetime, drop_unused_categories, dataframe_fingerprint
+)
+
+INSIGHT_CHART_COLUMNS = ["date", "start_time", "task", "time_taken", "priority", "category", "difficulty", "completed"]
 
 def process_heatmap_data(_df):
     """Process data for heatmap without caching for real-time updates."""
@@ -21,11 +25,15 @@ def process_heatmap_data(_df):
         if _df is None or _df.empty:
             return pd.DataFrame()
         
-        heatmap_data = _df.copy()
+        # Shallow copy: columns are only ever replaced, never written into
+        heatmap_data = _df.copy(deep=False)
     
         # Convert to datetime using shared utility
         try:
-            heatmap_data = prepare_datetime_columns(heatmap_data, copy=False)
+            heatmap_data = prepare_datetime_columns(
+                heatmap_data, copy=False,
+                time_parts=not {'hour', 'dow'}.issubset(heatmap_data.columns)
+            )
         except Exception as e:
             print(f"Error preparing datetime columns: {e}")
             return pd.DataFrame()
@@ -34,27 +42,32 @@ def process_heatmap_data(_df):
         if 'start_time' not in heatmap_data.columns or 'date' not in heatmap_data.columns:
             return pd.DataFrame()
         
+        day_order = ["Monday", "Tuesday", "Wednesday", "Thursday", 
+                    "Friday", "Saturday", "Sunday"]
         try:
-            heatmap_data['hour'] = heatmap_data['start_time'].dt.hour
-            heatmap_data['day_of_week'] = heatmap_data['date'].apply(lambda x: x.strftime('%A'))
+            # start_time falls on the task's date, so its weekday (0 = Monday) is the task's;
+            # rows without a start time (hour -1) or duration are skipped
+            hour = heatmap_data['hour'].to_numpy()
+            dow = heatmap_data['dow'].to_numpy()
+            minutes = pd.to_numeric(heatmap_data['time_taken'], errors='coerce').to_numpy(dtype=np.float64)
+            valid = (hour >= 0) & ~np.isnan(minutes)
         except Exception as e:
             print(f"Error extracting hour/day_of_week: {e}")
             return pd.DataFrame()
-    
-        day_order = ["Monday", "Tuesday", "Wednesday", "Thursday", 
-                    "Friday", "Saturday", "Sunday"]
-        heatmap_data['day_of_week'] = pd.Categorical(
-            heatmap_data['day_of_week'],
-            categories=day_order,
-            ordered=True
-        )
         
-        # Group and fill missing hours with 0
+        # Sum minutes into the fixed 7x24 grid with one bincount over flat (day, hour) cells;
+        # empty cells are 0
         try:
-            return (heatmap_data.groupby(['day_of_week', 'hour'])
-                 ['time_taken'].sum()
-                 .unstack()
-                 .reindex(columns=range(0,24), fill_value=0))
+            # Build the flat index in one buffer rather than allocating a temporary per operation
+            cells = dow[valid].astype(np.intp)
+            cells *= 24
+            cells += hour[valid]
+            grid = np.bincount(cells, weights=minutes[valid], minlength=7 * 24).reshape(7, 24)
+            return pd.DataFrame(
+                grid,
+                index=pd.CategoricalIndex(day_order, categories=day_order, ordered=True, name='day_of_week'),
+                columns=pd.Index(range(0, 24), name='hour')
+            )
         except Exception as e:
             print(f"Error grouping heatmap data: {e}")
             return pd.DataFrame()
@@ -63,8 +76,190 @@ def process_heatmap_data(_df):
         print(f"Unexpected error in process_heatmap_data: {e}")
         return pd.DataFrame()
 
-def show_insight_charts(data: pd.DataFrame):
-    """Display deep insight charts with comprehensive error handling."""
+
+# ==================== CACHED AGGREGATES ====================
+# Keyed on the caller's data key (or a fingerprint of the chart columns), so
+# reruns triggered by unrelated widgets reuse the previous results instead of
+# recomputing them.
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _cached_heatmap_data(data_key: str, _data: pd.DataFrame) -> pd.DataFrame:
+    """Day x hour heatmap grid for the keyed data."""
+    return process_heatmap_data(_data)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _cached_priority_data(data_key: str, _data: pd.DataFrame) -> pd.DataFrame:
+    """Total time per Low/Medium/High priority and category, for the sunburst chart."""
+    priority = _data['priority']
+    n_levels = len(VALID_PRIORITY_VALUES)
+    if (isinstance(priority.dtype, pd.CategoricalDtype)
+            and list(priority.cat.categories[:n_levels]) == VALID_PRIORITY_VALUES):
+        # categorize_columns lists the fixed levels first, so they are exactly codes 0..n-1
+        mask = priority.cat.codes.between(0, n_levels - 1)
+    else:
+        mask = priority.isin(VALID_PRIORITY_VALUES)
+    
+    # Only the per-(priority, category) totals are kept, so cache hits unpickle a few
+    # rows rather than the filtered task table; tasks without a category stay under their priority
+    totals = (_data[mask]
+              .groupby(['priority', 'category'], observed=True, sort=False, dropna=False)['time_taken']
+              .sum()
+              .reset_index())
+    return drop_unused_categories(totals)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _cached_difficulty_stats(data_key: str, _data: pd.DataFrame) -> pd.DataFrame:
+    """Average time, completion rate and task count per difficulty level (1-5)."""
+    difficulty = _data['difficulty'].to_numpy()
+    in_range = (difficulty >= 1) & (difficulty <= 5)
+    if not in_range.any():
+        return pd.DataFrame()
+    
+    # Difficulty has five known levels, so counts and sums come from bincounts over
+    # the level itself; only levels that occur get a row, in ascending order
+    levels = difficulty[in_range].astype(np.intp)
+    counts = np.bincount(levels, minlength=6)[1:]
+    total_time = np.bincount(levels, weights=_data['time_taken'].to_numpy(dtype=np.float64)[in_range], minlength=6)[1:]
+    if "completed" in _data.columns:
+        done = np.bincount(levels, weights=_data['completed'].to_numpy(dtype=np.float64)[in_range], minlength=6)[1:]
+    else:
+        done = np.zeros(5)
+    
+    present = counts > 0
+    return pd.DataFrame({
+        "difficulty": np.arange(1, 6, dtype=difficulty.dtype)[present],
+        "avg_time": total_time[present] / counts[present],
+        "completion_rate": done[present] / counts[present],
+        "task_count": counts[present]
+    })
+
+
+# ==================== CACHED FIGURES ====================
+# Figures are built from the cached aggregates above and share their data
+# key, so a rerun with unchanged data reuses the same Figure object instead of
+# rebuilding its traces and layout. They are never mutated after construction.
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _sunburst_figure(data_key: str, _priority_data: pd.DataFrame) -> go.Figure:
+    """Sunburst of time per priority and category."""
+    fig = px.sunburst(
+        _priority_data,
+        path=['priority', 'category'],
+        values='time_taken',
+        color='priority',
+        color_discrete_map=PRIORITY_COLORS,
+        hover_data={'time_taken': ':.0f min'},
+        height=600
+    )
+    fig.update_traces(
+        textinfo="label+percent parent",
+        textfont_size=14,
+        marker=dict(line=dict(color='white', width=1))
+    )
+    fig.update_layout(margin=dict(t=30, b=30))
+    return fig
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _difficulty_figure(data_key: str, _difficulty_stats: pd.DataFrame) -> go.Figure:
+    """Average time bars and completion rate line per difficulty level."""
+    # Plain arrays go straight to Plotly's ndarray path instead of Series serialization
+    levels = _difficulty_stats["difficulty"].to_numpy()
+    avg_time = _difficulty_stats["avg_time"].to_numpy()
+    completion_pct = _difficulty_stats["completion_rate"].to_numpy() * 100
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=levels,
+        y=avg_time,
+        name="Avg Time",
+        marker_color='#4B0082',  # Indigo
+        hovertemplate="<b>Difficulty %{x}</b><br>Avg: %{y:.1f} min<extra></extra>"
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=levels,
+        y=completion_pct,
+        name="Completion %",
+        line=dict(color='#9370DB', width=3),  # Medium Purple
+        yaxis="y2",
+        mode='lines+markers',
+        marker=dict(size=10),
+        hovertemplate="<b>%{y:.1f}% completed</b><extra></extra>"
+    ))
+
+    fig.update_layout(
+        title="Performance by Task Difficulty",
+        xaxis_title="Difficulty Level (1-5)",
+        yaxis_title="Average Time (minutes)",
+        yaxis2=dict(
+            title="Completion Rate (%)",
+            overlaying="y",
+            side="right",
+            range=[0, 100]
+        ),
+        hovermode="x unified",
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=500
+    )
+    return fig
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _heatmap_figure(data_key: str, _heatmap_stats: pd.DataFrame) -> go.Figure:
+    """Day x hour heatmap of minutes spent."""
+    peak = float(_heatmap_stats.to_numpy().max())
+    
+    fig = px.imshow(
+        _heatmap_stats,
+        labels=dict(x="Hour", y="Day", color="Minutes"),
+        color_continuous_scale=HEATMAP_COLORS,
+        aspect="auto",
+        zmin=0,
+        zmax=max(peak, 60)  # Minimum scale of 60 mins
+    )
+
+    fig.update_traces(
+        hovertemplate="<b>%{y}</b><br>%{x}:00-%{x}:59<br><b>%{z:.0f} mins</b><extra></extra>",
+        hoverongaps=False
+    )
+
+    fig.update_layout(
+        xaxis=dict(
+            tickmode='array',
+            tickvals=list(range(0, 24, 2)),
+            ticktext=[f"{h}:00" for h in range(0, 24, 2)],
+            title="Hour of Day"
+        ),
+        yaxis=dict(title=""),
+        height=650,
+        margin=dict(t=50, b=20),
+        coloraxis_colorbar=dict(
+            title="Minutes",
+            thickness=20,
+            tickvals=np.linspace(0, peak, 5),
+            tickformat=".0f"
+        )
+    )
+    return fig
+
+
+def _section_enabled(key: str, label: str) -> bool:
+    """Session-state toggle for a chart section; its aggregates and figure are only built while it is on."""
+    return st.toggle(label, value=True, key=key)
+
+
+def show_insight_charts(data: pd.DataFrame, data_key: str = None):
+    """
+    Display deep insight charts with comprehensive error handling.
+    
+    Args:
+        data: Task DataFrame
+        data_key: Identifies this version of the data for the aggregate and figure caches
+            (e.g. get_data_version()); a fingerprint of the chart columns is used if omitted
+    """
     try:
         st.markdown("## 🔍 Deep Insights", help="Analyze your productivity patterns and trends")
         
@@ -72,15 +267,15 @@ def show_insight_charts(data: pd.DataFrame):
             st.info("📭 No data available for insight charts")
             return
     
-        # Data Preparation
-        data = data.copy()
+        # Data Preparation (shallow copy: time_taken and the date columns are replaced, not modified)
+        data = data.copy(deep=False)
         try:
             # Convert numeric fields
             data["time_taken"] = pd.to_numeric(data["time_taken"], errors="coerce").fillna(0)
             data = data[data["time_taken"] > 0]
             
             # Convert date/time fields using shared utility
-            data = prepare_datetime_columns(data, copy=False)
+            data = prepare_datetime_columns(data, copy=False, time_parts=True)
         except Exception as e:
             st.error(f"🔧 Data preparation error: {str(e)}")
             return
@@ -89,65 +284,65 @@ def show_insight_charts(data: pd.DataFrame):
             st.warning("No valid data available after processing")
             return
 
+        if data_key is None:
+            data_key = dataframe_fingerprint(data, INSIGHT_CHART_COLUMNS)
+
         # Highlights strip for quick takeaways
         try:
             with st.container():
                 st.markdown("### ✨ Highlights")
                 col1, col2, col3 = st.columns(3)
 
+                # Minutes as a plain array, shared by the per-hour and per-day totals below
+                minutes = data["time_taken"].to_numpy(dtype=np.float64)
+
                 # Peak hour from start_time
                 peak_hour_label = "Not enough data"
                 if "start_time" in data.columns and not data["start_time"].isna().all():
-                    hour_counts = data.copy()
-                    hour_counts["hour"] = hour_counts["start_time"].dt.hour
-                    hour_counts = hour_counts.groupby("hour")["time_taken"].sum().sort_values(ascending=False)
-                    if not hour_counts.empty:
-                        h = int(hour_counts.index[0])
-                        peak_hour_label = f"{h:02d}:00 - {h+1:02d}:00"
+                    hours = data["hour"].to_numpy()
+                    has_start = hours >= 0
+                    hour_totals = np.bincount(hours[has_start], weights=minutes[has_start], minlength=24)
+                    h = int(hour_totals.argmax())
+                    peak_hour_label = f"{h:02d}:00 - {h+1:02d}:00"
                 col1.metric("⏱️ Peak Hour", peak_hour_label)
 
                 # Best day by total time
                 best_day_label = "Not enough data"
                 if "date" in data.columns and not data["date"].isna().all():
-                    day_totals = data.groupby("date")["time_taken"].sum().sort_values(ascending=False)
-                    if not day_totals.empty:
-                        best_day_label = day_totals.index[0].strftime("%a, %b %d")
+                    day_codes, days = pd.factorize(data["date"], sort=True)
+                    has_day = day_codes >= 0
+                    day_totals = np.bincount(day_codes[has_day], weights=minutes[has_day], minlength=len(days))
+                    best_day_label = days[day_totals.argmax()].strftime("%a, %b %d")
                 col2.metric("📅 Best Day", best_day_label)
 
                 # Mood with highest completion rate (if available)
                 top_mood_label = "Not enough data"
                 if "mood" in data.columns and "completed" in data.columns and not data["mood"].isna().all():
-                    mood_stats = data.groupby("mood").agg(count=("task", "count"), comp=("completed", "mean"))
-                    mood_stats = mood_stats[mood_stats["count"] >= 3]  # require some support
-                    if not mood_stats.empty:
-                        best_mood = mood_stats.sort_values("comp", ascending=False).index[0]
-                        top_mood_label = f"{best_mood} ({mood_stats.loc[best_mood, 'comp']*100:.0f}% completion)"
+                    # Completed tasks and task counts per mood in two bincount passes
+                    mood_codes, moods = pd.factorize(data["mood"])
+                    has_mood = mood_codes >= 0
+                    mood_codes = mood_codes[has_mood]
+                    completed = data["completed"].to_numpy(dtype=np.float64)[has_mood]
+                    done = np.bincount(mood_codes, weights=completed, minlength=len(moods))
+                    counts = np.bincount(mood_codes, minlength=len(moods))
+                    supported = counts >= 3  # require some support
+                    if supported.any():
+                        rates = np.where(supported, done / np.maximum(counts, 1), -1.0)
+                        best = rates.argmax()
+                        top_mood_label = f"{moods[best]} ({rates[best]*100:.0f}% completion)"
                 col3.metric("😊 Best Mood", top_mood_label)
         except Exception as e:
             st.warning(f"Highlights unavailable: {str(e)}")
 
         # 1. Priority Sunburst Chart
         try:
-            if all(col in data.columns for col in ['priority', 'category']):
+            if (all(col in data.columns for col in ['priority', 'category'])
+                    and _section_enabled("insight_show_priority", "Show time allocation by priority")):
                 with st.expander("⏳ Time Allocation by Priority", expanded=True):
-                    priority_data = data[data['priority'].isin(['Low', 'Medium', 'High'])].copy()
+                    priority_data = _cached_priority_data(data_key, data)
                     
                     if not priority_data.empty:
-                        fig = px.sunburst(
-                            priority_data,
-                            path=['priority', 'category'],
-                            values='time_taken',
-                            color='priority',
-                            color_discrete_map=PRIORITY_COLORS,
-                            hover_data={'time_taken': ':.0f min'},
-                            height=600
-                        )
-                        fig.update_traces(
-                            textinfo="label+percent parent",
-                            textfont_size=14,
-                            marker=dict(line=dict(color='white', width=1))
-                        )
-                        fig.update_layout(margin=dict(t=30, b=30))
+                        fig = _sunburst_figure(data_key, priority_data)
                         st.plotly_chart(fig, use_container_width=True)
                     else:
                         st.warning("No valid priority data available")
@@ -156,97 +351,30 @@ def show_insight_charts(data: pd.DataFrame):
 
         # 2. Difficulty Analysis
         try:
-            if 'difficulty' in data.columns:
+            if ('difficulty' in data.columns
+                    and _section_enabled("insight_show_difficulty", "Show task difficulty analysis")):
                 with st.expander("📊 Task Difficulty Analysis", expanded=True):
-                    difficulty_data = data[(data['difficulty'] >= 1) & (data['difficulty'] <= 5)].copy()
+                    difficulty_stats = _cached_difficulty_stats(data_key, data)
                     
-                    if not difficulty_data.empty:
-                        difficulty_stats = difficulty_data.groupby("difficulty").agg(
-                            avg_time=("time_taken", "mean"),
-                            completion_rate=("completed", "mean" if "completed" in difficulty_data.columns else lambda x: 0),
-                            task_count=("task", "count")
-                        ).reset_index()
-                        
-                        fig = go.Figure()
-                        fig.add_trace(go.Bar(
-                            x=difficulty_stats["difficulty"],
-                            y=difficulty_stats["avg_time"],
-                            name="Avg Time",
-                            marker_color='#4B0082',  # Indigo
-                            hovertemplate="<b>Difficulty %{x}</b><br>Avg: %{y:.1f} min<extra></extra>"
-                        ))
-                        
-                        fig.add_trace(go.Scatter(
-                            x=difficulty_stats["difficulty"],
-                            y=difficulty_stats["completion_rate"]*100,
-                            name="Completion %",
-                            line=dict(color='#9370DB', width=3),  # Medium Purple
-                            yaxis="y2",
-                            mode='lines+markers',
-                            marker=dict(size=10),
-                            hovertemplate="<b>%{y:.1f}% completed</b><extra></extra>"
-                        ))
-                        
-                        fig.update_layout(
-                            title="Performance by Task Difficulty",
-                            xaxis_title="Difficulty Level (1-5)",
-                            yaxis_title="Average Time (minutes)",
-                            yaxis2=dict(
-                                title="Completion Rate (%)",
-                                overlaying="y",
-                                side="right",
-                                range=[0, 100]
-                            ),
-                            hovermode="x unified",
-                            plot_bgcolor='rgba(0,0,0,0)',
-                            height=500
-                        )
+                    if not difficulty_stats.empty:
+                        fig = _difficulty_figure(data_key, difficulty_stats)
                         st.plotly_chart(fig, use_container_width=True)
         except Exception as e:
             st.error(f"Error creating difficulty analysis chart: {str(e)}")
 
         # 3. Enhanced Heatmap Visualization
         try:
+            if not _section_enabled("insight_show_heatmap", "Show productivity heatmap"):
+                return
             with st.expander("🔥 Productivity Heatmap (24 Hours)", expanded=True):
                 if "start_time" in data.columns:
                     try:
-                        heatmap_stats = process_heatmap_data(data)
+                        heatmap_stats = _cached_heatmap_data(data_key, data)
                         
                         if heatmap_stats.empty:
                             st.warning("No data available for heatmap")
                         else:
-                            fig = px.imshow(
-                                heatmap_stats,
-                                labels=dict(x="Hour", y="Day", color="Minutes"),
-                                color_continuous_scale=HEATMAP_COLORS,
-                                aspect="auto",
-                                zmin=0,
-                                zmax=max(heatmap_stats.max().max(), 60)  # Minimum scale of 60 mins
-                            )
-                            
-                            fig.update_traces(
-                                hovertemplate="<b>%{y}</b><br>%{x}:00-%{x}:59<br><b>%{z:.0f} mins</b><extra></extra>",
-                                hoverongaps=False
-                            )
-                            
-                            fig.update_layout(
-                                xaxis=dict(
-                                    tickmode='array',
-                                    tickvals=list(range(0, 24, 2)),
-                                    ticktext=[f"{h}:00" for h in range(0, 24, 2)],
-                                    title="Hour of Day"
-                                ),
-                                yaxis=dict(title=""),
-                                height=650,
-                                margin=dict(t=50, b=20),
-                                coloraxis_colorbar=dict(
-                                    title="Minutes",
-                                    thickness=20,
-                                    tickvals=np.linspace(0, heatmap_stats.max().max(), 5),
-                                    tickformat=".0f"
-                                )
-                            )
-                            
+                            fig = _heatmap_figure(data_key, heatmap_stats)
                             st.plotly_chart(fig, use_container_width=True)
                             
                             # Peak hours analysis
@@ -1,6 +1,26 @@
 # ==================== IMPORTS ====================
 # Data processing
 import pandas as pd
+import numpy as np
+
+
+def _completion_rates(keys: pd.Series, completed: np.ndarray):
+    """
+    Completion rate per distinct key, from one factorize and two bincount passes.
+    
+    Args:
+        keys: Column to group by; rows with a missing key are skipped
+        completed: Completion flags as float64, aligned with keys
+        
+    Returns:
+        (keys, rates): the distinct keys in sorted order and their completion rates
+    """
+    codes, uniques = pd.factorize(keys, sort=True)
+    has_key = codes >= 0
+    done = np.bincount(codes[has_key], weights=completed[has_key], minlength=len(uniques))
+    counts = np.bincount(codes[has_key], minlength=len(uniques))
+    return uniques, done / np.maximum(counts, 1)
+
 
 class MLInsightsGenerator:
     def __init__(self):
@@ -15,25 +35,27 @@ class MLInsightsGenerator:
                 insights["status"] = "Need more data (at least 20 tasks) for ML insights"
                 return insights
             
+            # Every breakdown below is a completion rate, so read the flags once
+            completed = data['completed'].to_numpy(dtype=np.float64)
+            
             # Completion rate by difficulty
             if 'difficulty' in data.columns:
-                diff_completion = data.groupby('difficulty')['completed'].mean()
-                if len(diff_completion) > 1:
-                    best_diff = diff_completion.idxmax()
-                    worst_diff = diff_completion.idxmin()
+                levels, rates = _completion_rates(data['difficulty'], completed)
+                if len(levels) > 1:
+                    best, worst = rates.argmax(), rates.argmin()
                     insights["difficulty"] = (
-                        f"Peak completion at difficulty {best_diff} ({diff_completion[best_diff]*100:.0f}%) | "
-                        f"Struggle with difficulty {worst_diff} ({diff_completion[worst_diff]*100:.0f}%)"
+                        f"Peak completion at difficulty {levels[best]} ({rates[best]*100:.0f}%) | "
+                        f"Struggle with difficulty {levels[worst]} ({rates[worst]*100:.0f}%)"
                     )
             
             # Energy vs Performance
             if 'energy_level' in data.columns:
-                energy_completion = data.groupby('energy_level')['completed'].mean()
-                if len(energy_completion) > 1:
-                    best_energy = energy_completion.idxmax()
+                levels, rates = _completion_rates(data['energy_level'], completed)
+                if len(levels) > 1:
+                    best = rates.argmax()
                     insights["energy"] = (
-                        f"Optimal energy level: {best_energy} ({energy_completion[best_energy]*100:.0f}% completion) | "
-                        f"Performance drops {((energy_completion.max() - energy_completion.min())/energy_completion.max())*100:.0f}% across energy levels"
+                        f"Optimal energy level: {levels[best]} ({rates[best]*100:.0f}% completion) | "
+                        f"Performance drops {((rates.max() - rates.min())/rates.max())*100:.0f}% across energy levels"
                     )
             
             # Time patterns
@@ -47,32 +69,27 @@ class MLInsightsGenerator:
             
             # Category performance
             if 'category' in data.columns:
-                cat_stats = data.groupby('category').agg(
-                    count=('task', 'count'),
-                    completion_rate=('completed', 'mean'),
-                    avg_time=('time_taken', 'mean')
-                )
-                if len(cat_stats) > 1:
-                    best_cat = cat_stats['completion_rate'].idxmax()
-                    worst_cat = cat_stats['completion_rate'].idxmin()
+                categories, rates = _completion_rates(data['category'], completed)
+                if len(categories) > 1:
+                    best, worst = rates.argmax(), rates.argmin()
                     insights["category"] = (
-                        f"Best performing: {best_cat} ({cat_stats.loc[best_cat, 'completion_rate']*100:.0f}%) | "
-                        f"Needs improvement: {worst_cat} ({cat_stats.loc[worst_cat, 'completion_rate']*100:.0f}%)"
+                        f"Best performing: {categories[best]} ({rates[best]*100:.0f}%) | "
+                        f"Needs improvement: {categories[worst]} ({rates[worst]*100:.0f}%)"
                     )
             
             # Time of day patterns
             if 'start_time' in data.columns:
                 try:
-                    data['hour'] = pd.to_datetime(data['start_time']).dt.hour
-                    hour_stats = data.groupby('hour').agg(
-                        count=('task', 'count'),
-                        completion_rate=('completed', 'mean')
-                    )
-                    if len(hour_stats) > 1:
-                        best_hour = hour_stats['completion_rate'].idxmax()
+                    start_times = data['start_time']
+                    if not pd.api.types.is_datetime64_any_dtype(start_times):
+                        start_times = pd.to_datetime(start_times)
+                    has_start = start_times.notna().to_numpy()
+                    hours, rates = _completion_rates(start_times[has_start].dt.hour, completed[has_start])
+                    if len(hours) > 1:
+                        best = rates.argmax()
                         insights["time_of_day"] = (
-                            f"Most productive hour: {best_hour}:00 ({hour_stats.loc[best_hour, 'completion_rate']*100:.0f}%) | "
-                            f"Least productive: {hour_stats['completion_rate'].idxmin()}:00"
+                            f"Most productive hour: {hours[best]}:00 ({rates[best]*100:.0f}%) | "
+                            f"Least productive: {hours[rates.argmin()]}:00"
                         )
                 except:
                     pass
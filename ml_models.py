@@ -5,23 +5,55 @@ import numpy as np
 from datetime import datetime, date
 
 # Machine Learning
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.ensemble import HistGradientBoostingClassifier, HistGradientBoostingRegressor
 from sklearn.metrics import accuracy_score, mean_absolute_error
 from sklearn.model_selection import train_test_split
+from sklearn.exceptions import NotFittedError
 
 # Utilities
 import warnings
+import logging
 
 # Local modules
 from encoding_utils import CategoricalEncoder
 from data_preprocessing import (
     ensure_numeric_columns,
     extract_hour_from_datetime,
-    extract_date_components
+    extract_date_components,
+    dataframe_fingerprint
 )
 
 warnings.filterwarnings('ignore')
 
+logger = logging.getLogger(__name__)
+
+# Histogram-based trees split label-encoded columns natively, as long as every code
+# fits in one of the model's bins (codes 0..254 with the default max_bins)
+MAX_CATEGORICAL_CODES = 255
+
+
+def categorical_feature_mask(X: pd.DataFrame) -> list:
+    """
+    Mark the *_encoded columns of X that can be split as categoricals.
+    
+    Args:
+        X: Feature frame the model is fitted on
+        
+    Returns:
+        One bool per column, True for encoded columns whose codes fit the bins
+    """
+    return [
+        col.endswith('_encoded') and X[col].between(0, MAX_CATEGORICAL_CODES - 1).all()
+        for col in X.columns
+    ]
+
+# Source columns each model's features are built from, used to fingerprint its training data
+CATEGORICAL_FEATURE_COLUMNS = ['category', 'priority', 'mood', 'intent']
+COMPLETION_SOURCE_COLUMNS = ['difficulty', 'energy_level', 'focus_level', 'time_taken', 'start_time', 'date',
+                             'completed'] + CATEGORICAL_FEATURE_COLUMNS
+TIME_SOURCE_COLUMNS = ['difficulty', 'time_taken'] + CATEGORICAL_FEATURE_COLUMNS
+
+
 class MLModelHandler:
     def __init__(self):
         self.completion_model = None
@@ -29,34 +61,41 @@ class MLModelHandler:
         self.encoders = CategoricalEncoder()
         self.completion_accuracy = 0
         self.time_mae = 0
+        # Fingerprints of the data each model and the encoders were last fitted on; a
+        # retrain on unchanged data (e.g. a Streamlit rerun) keeps the fitted model
+        self._completion_fit_key = None
+        self._time_fit_key = None
+        self._encoder_key = None
+    
+    def _is_fitted_on(self, model, fit_key: str, last_fit_key: str, data: pd.DataFrame) -> bool:
+        """Whether model was last fitted on this data and the encoders were fitted on its categoricals."""
+        return (model is not None and fit_key == last_fit_key
+                and self._encoder_key == dataframe_fingerprint(data, CATEGORICAL_FEATURE_COLUMNS))
         
     def prepare_features(self, data: pd.DataFrame):
         """Prepare features for ML models."""
         if data.empty:
             return pd.DataFrame(), {}
         
-        df = data.copy()
+        # Every step below replaces whole columns, so a shallow copy keeps data untouched
+        df = data.copy(deep=False)
         
         # Use shared utility for numeric column preparation
+        # The same narrow dtypes clean_data stores, so features stay small on their way into the trees
         numeric_mapping = {
-            'difficulty': (int, 3),
-            'energy_level': (int, 5),
-            'focus_level': (int, 5),
-            'time_taken': (float, 30)
+            'difficulty': (np.int8, 3),
+            'energy_level': (np.int8, 5),
+            'focus_level': (np.int8, 5),
+            'time_taken': (np.float32, 30)
         }
-        df = ensure_numeric_columns(df, numeric_mapping)
-        
-        # Use shared encoder for categorical columns
-        categorical_cols = ['category', 'priority', 'mood', 'intent']
-        for col in categorical_cols:
-            if col in df.columns:
-                df[col] = df[col].fillna('unknown').astype(str)
-                self.encoders.fit_categorical_column(df, col)
-                df = self.encoders.encode_column(df, col)
-            else:
+        df = ensure_numeric_columns(df, numeric_mapping, copy=False)
+        
+        # Use shared encoder for categorical columns; fitting and encoding share one pass
+        self._encoder_key = dataframe_fingerprint(data, CATEGORICAL_FEATURE_COLUMNS)
+        for col in CATEGORICAL_FEATURE_COLUMNS:
+            if col not in df.columns:
                 df[col] = 'unknown'
-                self.encoders.fit_categorical_column(df, col)
-                df = self.encoders.encode_column(df, col)
+            df[f"{col}_encoded"] = self.encoders.fit_transform_values(col, df[col])
         
         # Extract date/time features using shared utility
         df['start_time'] = pd.to_datetime(df['start_time'], errors='coerce')
@@ -72,6 +111,10 @@ class MLModelHandler:
             if data is None or data.empty:
                 return "No data provided for training"
             
+            fit_key = dataframe_fingerprint(data, COMPLETION_SOURCE_COLUMNS)
+            if self._is_fitted_on(self.completion_model, fit_key, self._completion_fit_key, data):
+                return f"Completion model trained with accuracy: {self.completion_accuracy:.1%}"
+            
             df = self.prepare_features(data)
             
             if df.empty or len(df) < 20:
@@ -83,25 +126,33 @@ class MLModelHandler:
                 'priority_encoded', 'mood_encoded', 'intent_encoded'
             ]
             
-            X = df[feature_cols].fillna(0)
+            features = df[feature_cols].fillna(0)
+            categorical = categorical_feature_mask(features)
+            
+            # The boosters validate X to contiguous float64, so build that array once here
+            # (a float32 matrix would only be converted back); fitting on an array also
+            # matches the unnamed arrays the predict methods pass
+            X = np.ascontiguousarray(features.to_numpy(dtype=np.float64))
             y = df['completed'].fillna(False).astype(bool)
             
             X_train, X_test, y_train, y_test = train_test_split(
                 X, y, test_size=0.25, random_state=42, stratify=y
             )
             
-            self.completion_model = RandomForestClassifier(
-                n_estimators=100,  # Increased from 50
-                max_depth=12,      # Increased from 10
-                random_state=42,
-                min_samples_split=5,
+            self.completion_model = HistGradientBoostingClassifier(
+                max_iter=100,
+                max_depth=12,
+                max_leaf_nodes=31,
                 min_samples_leaf=2,
+                random_state=42,
+                categorical_features=categorical,
                 class_weight='balanced'  # Handle class imbalance
             )
             
             self.completion_model.fit(X_train, y_train)
             y_pred = self.completion_model.predict(X_test)
             self.completion_accuracy = accuracy_score(y_test, y_pred)
+            self._completion_fit_key = fit_key
             
             return f"Completion model trained with accuracy: {self.completion_accuracy:.1%}"
             
@@ -119,6 +170,10 @@ class MLModelHandler:
             if data is None or data.empty:
                 return "No data provided for training"
             
+            fit_key = dataframe_fingerprint(data, TIME_SOURCE_COLUMNS)
+            if self._is_fitted_on(self.time_model, fit_key, self._time_fit_key, data):
+                return f"Time estimation model trained with MAE: {self.time_mae:.1f} minutes"
+            
             df = self.prepare_features(data)
             
             if df.empty or len(df) < 20:
@@ -129,24 +184,33 @@ class MLModelHandler:
                 'priority_encoded', 'intent_encoded'
             ]
             
-            X = df[feature_cols].fillna(0)
+            features = df[feature_cols].fillna(0)
+            categorical = categorical_feature_mask(features)
+            
+            # The boosters validate X to contiguous float64, so build that array once here
+            # (a float32 matrix would only be converted back); fitting on an array also
+            # matches the unnamed arrays the predict methods pass
+            X = np.ascontiguousarray(features.to_numpy(dtype=np.float64))
             y = df['time_taken'].fillna(30)
             
             X_train, X_test, y_train, y_test = train_test_split(
                 X, y, test_size=0.25, random_state=42
             )
             
-            self.time_model = RandomForestRegressor(
-                n_estimators=100,  # Increased from 50
-                max_depth=12,     # Increased from 10
+            self.time_model = HistGradientBoostingRegressor(
+                loss='absolute_error',  # Minimize the MAE reported below directly
+                max_iter=100,
+                max_depth=12,
+                max_leaf_nodes=31,
+                min_samples_leaf=2,
                 random_state=42,
-                min_samples_split=5,
-                min_samples_leaf=2
+                categorical_features=categorical
             )
             
             self.time_model.fit(X_train, y_train)
             y_pred = self.time_model.predict(X_test)
             self.time_mae = mean_absolute_error(y_test, y_pred)
+            self._time_fit_key = fit_key
             
             return f"Time estimation model trained with MAE: {self.time_mae:.1f} minutes"
             
@@ -158,83 +222,98 @@ class MLModelHandler:
             import traceback
             return f"Error training time estimator: {str(e)}"
 
+    def _task_features(self, task_list: list, numeric_features: list, categorical_cols: list) -> np.ndarray:
+        """
+        Build the feature matrix for a batch of task dicts in one pass per column.
+        
+        Args:
+            task_list: Task dicts; missing keys take the feature's default
+            numeric_features: (key, default, low, high) tuples, clipped to [low, high] unless low is None
+            categorical_cols: Columns coded with the fitted encoders (0 when not fitted)
+            
+        Returns:
+            float32 array of shape (len(task_list), n_features), in training column order;
+            rows with a missing or non-numeric value, or that are not dicts, hold NaN
+        """
+        is_task = np.array([isinstance(task, dict) for task in task_list], dtype=bool)
+        tasks = [task if ok else {} for task, ok in zip(task_list, is_task)]
+        X = np.empty((len(tasks), len(numeric_features) + len(categorical_cols)), dtype=np.float32)
+        
+        # Values are coerced one by one, so a bad value only turns its own row to NaN
+        for j, (key, default, low, high) in enumerate(numeric_features):
+            values = pd.Series([task.get(key, default) for task in tasks], dtype=object)
+            X[:, j] = pd.to_numeric(values, errors='coerce')
+            if low is not None:
+                np.clip(X[:, j], low, high, out=X[:, j])
+        
+        # Use centralized encoder for categorical features, one call per column
+        for j, col in enumerate(categorical_cols, start=len(numeric_features)):
+            if col in self.encoders.encoders:
+                # Unseen values get the code of 'unknown'
+                X[:, j] = self.encoders.encode_values(col, (task.get(col, 'unknown') for task in tasks))
+            else:
+                X[:, j] = 0
+        
+        X[~is_task] = np.nan
+        return X
+
     def predict_completion_probability(self, task_data: dict):
         """Predict task completion probability."""
-        try:
-            if task_data is None or not isinstance(task_data, dict):
-                return 50.0
-            
-            if self.completion_model is None:
-                return 50.0  # Default if no model
-            
-            features = []
-            features.append(max(1, min(5, task_data.get('difficulty', 3))))
-            features.append(max(1, min(10, task_data.get('energy_level', 5))))
-            features.append(max(1, min(10, task_data.get('focus_level', 5))))
-            features.append(task_data.get('time_taken', 30))
-            features.append(task_data.get('hour', 12))
-            features.append(task_data.get('day_of_week', 1))
-            
-            # Use centralized encoder for categorical features
-            for col in ['category', 'priority', 'mood', 'intent']:
-                if col in self.encoders.encoders:
-                    try:
-                        value = task_data.get(col, 'unknown')
-                        encoded = self.encoders.encoders[col].transform([str(value)])[0]
-                        features.append(encoded)
-                    except (ValueError, KeyError):
-                        features.append(self.encoders.encoders[col].transform(['unknown'])[0])
-                    except Exception:
-                        features.append(0)
-                else:
-                    features.append(0)
-            
-            X = np.array(features).reshape(1, -1)
-            prob = self.completion_model.predict_proba(X)[0][1]
-            return round(prob * 100, 1)
-            
-        except (ValueError, TypeError) as e:
-            print(f"Invalid task data format: {e}")
-            return 50.0
-        except Exception as e:
-            import traceback
-            print(f"Error predicting task completion: {e}")
+        if task_data is None or not isinstance(task_data, dict):
             return 50.0
+        return self.predict_completion_probability_batch([task_data])[0]
+
+    def predict_completion_probability_batch(self, task_list: list) -> list:
+        """Predict completion probabilities (percent) for many tasks with one model call."""
+        if self.completion_model is None or not task_list:
+            return [50.0] * len(task_list or [])  # Default if no model
+        
+        X = self._task_features(
+            task_list,
+            [('difficulty', 3, 1, 5), ('energy_level', 5, 1, 10), ('focus_level', 5, 1, 10),
+             ('time_taken', 30, None, None), ('hour', 12, None, None), ('day_of_week', 1, None, None)],
+            ['category', 'priority', 'mood', 'intent']
+        )
+        
+        # Only failures of the model call itself fall back for the whole batch
+        try:
+            probs = np.round(self.completion_model.predict_proba(X)[:, 1] * 100, 1)
+        except NotFittedError as e:
+            logger.warning(f"Completion model is not fitted: {e}")
+            return [50.0] * len(task_list)
+        except ValueError as e:
+            logger.error(f"Completion model rejected features of shape {X.shape}: {e}")
+            return [50.0] * len(task_list)
+        
+        probs[np.isnan(X).any(axis=1)] = 50.0  # Invalid task data
+        return probs.tolist()
 
     def predict_task_duration(self, task_data: dict):
         """Predict task duration."""
-        try:
-            if task_data is None or not isinstance(task_data, dict):
-                return 30
-            
-            if self.time_model is None:
-                return 30
-            
-            features = []
-            features.append(max(1, min(5, task_data.get('difficulty', 3))))
-            
-            for col in ['category', 'priority', 'intent']:
-                if col in self.encoders.encoders:
-                    try:
-                        value = task_data.get(col, 'unknown')
-                        encoded = self.encoders.encoders[col].transform([str(value)])[0]
-                        features.append(encoded)
-                    except (ValueError, KeyError):
-                        features.append(self.encoders.encoders[col].transform(['unknown'])[0])
-                    except Exception:
-                        features.append(0)
-                else:
-                    features.append(0)
-            
-            X = np.array(features).reshape(1, -1)
-            duration = self.time_model.predict(X)[0]
-            duration = max(5, min(480, round(duration / 5) * 5))
-            return int(duration)
-            
-        except (ValueError, TypeError) as e:
-            print(f"Invalid task data format: {e}")
+        if task_data is None or not isinstance(task_data, dict):
             return 30
-        except Exception as e:
-            import traceback
-            print(f"Error predicting task duration: {e}")
-            return 30
\ No newline at end of file
+        return self.predict_task_duration_batch([task_data])[0]
+
+    def predict_task_duration_batch(self, task_list: list) -> list:
+        """Predict durations (minutes, rounded to 5 and kept within 5-480) for many tasks with one model call."""
+        if self.time_model is None or not task_list:
+            return [30] * len(task_list or [])
+        
+        X = self._task_features(
+            task_list,
+            [('difficulty', 3, 1, 5)],
+            ['category', 'priority', 'intent']
+        )
+        
+        # Only failures of the model call itself fall back for the whole batch
+        try:
+            durations = np.clip(np.round(self.time_model.predict(X) / 5) * 5, 5, 480)
+        except NotFittedError as e:
+            logger.warning(f"Time model is not fitted: {e}")
+            return [30] * len(task_list)
+        except ValueError as e:
+            logger.error(f"Time model rejected features of shape {X.shape}: {e}")
+            return [30] * len(task_list)
+        
+        durations[np.isnan(X).any(axis=1)] = 30  # Invalid task data
+        return durations.astype(int).tolist()
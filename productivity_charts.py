@@ -4,14 +4,15 @@ import streamlit as st
 
 # Data processing
 import pandas as pd
-from datetime import datetime, timedelta
+import numpy as np
+from datetime import datetime
 
 # Visualization
 import plotly.express as px
 import plotly.graph_objects as go
 
 # Local modules
-from data_preprocessing import prepare_datetime_columns
+from data_preprocessing import prepare_datetime_columns, drop_unused_categories
 
 def show_productivity_charts(data: pd.DataFrame):
     """Display productivity metrics charts with error handling."""
@@ -44,19 +45,29 @@ def show_productivity_charts(data: pd.DataFrame):
         # Weekly productivity trend
         try:
             st.markdown("### Weekly Productivity Trend")
-            weekly_data = data.copy()
+            weekly_data = data.copy(deep=False)  # Columns below are replaced, never written into
             
             if "date" not in weekly_data.columns:
                 st.warning("Date column not found")
                 return
             
-            weekly_data["week"] = weekly_data["date"].apply(lambda x: x - timedelta(days=x.weekday()))
+            # Monday of each task's week, computed on datetime64 values instead of per row
+            dates = pd.to_datetime(weekly_data["date"])
+            weekly_data["week"] = dates - pd.to_timedelta(dates.dt.dayofweek, unit="D")
             
+            # Completion flags as 0/1 so every aggregate runs in pandas' built-in reducers;
+            # task is never missing after clean_data, so size matches count without the NaN checks
+            if "completed" in weekly_data.columns:
+                weekly_data["completed"] = (weekly_data["completed"] == True).astype("int8")
+            else:
+                weekly_data["completed"] = np.int8(0)
             weekly_stats = weekly_data.groupby("week").agg(
                 total_time=("time_taken", "sum"),
-                completed=("completed", lambda x: (x == True).sum() if "completed" in weekly_data.columns else 0),
-                task_count=("task", "count")
+                completed=("completed", "sum"),
+                task_count=("task", "size")
             ).reset_index()
+            # Back to date labels, now only one per week
+            weekly_stats["week"] = weekly_stats["week"].dt.date
             
             if weekly_stats.empty:
                 st.info("No weekly data available")
@@ -111,10 +122,10 @@ def show_productivity_charts(data: pd.DataFrame):
         try:
             if all(col in data.columns for col in ['focus_level', 'energy_level', 'category', 'task', 'date']):
                 st.markdown("### Focus vs Energy Analysis")
-                focus_energy = data[
+                focus_energy = drop_unused_categories(data[
                     (data['focus_level'] != -1) & 
                     (data['energy_level'] != -1)
-                ].copy()
+                ].copy())
                 
                 if focus_energy.empty:
                     st.info("No focus/energy data available")
@@ -152,11 +163,12 @@ def show_productivity_charts(data: pd.DataFrame):
                 if mood_data.empty:
                     st.info("No mood data available")
                 else:
-                    mood_stats = mood_data.groupby("mood").agg(
+                    mood_stats = mood_data.groupby("mood", observed=True).agg(
                         avg_time=("time_taken", "mean"),
                         completion_rate=("completed", "mean" if "completed" in mood_data.columns else lambda x: 0),
                         task_count=("task", "count")
                     ).reset_index()
+                    drop_unused_categories(mood_stats)
                     
                     mood_stats["avg_time"] = mood_stats["avg_time"].round(1)
                     mood_stats["completion_rate"] = (mood_stats["completion_rate"] * 100).round(1)
@@ -2,17 +2,24 @@
 # Data processing
 import pandas as pd
 import numpy as np
+from scipy import sparse
 
 # Machine Learning
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.preprocessing import StandardScaler, OneHotEncoder
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import StandardScaler, OneHotEncoder, normalize
+from sklearn.metrics.pairwise import linear_kernel
+
+# Local modules
+from data_preprocessing import dataframe_fingerprint
 
 class TaskRecommender:
     def __init__(self):
         self.tfidf_vectorizer = None
         self.scaler = None
         self.encoder = None
+        # Row-normalized sparse feature matrix from the last fit, reused while the data is unchanged
+        self._fit_key = None
+        self._feature_matrix = None
         
     def preprocess_data(self, df: pd.DataFrame):
         """Preprocess data for recommendations."""
@@ -43,7 +50,7 @@ class TaskRecommender:
         for col in categorical_cols:
             if col not in processed_df.columns:
                 processed_df[col] = 'unknown'
-            processed_df[col] = processed_df[col].fillna('unknown').astype(str)
+            processed_df[col] = processed_df[col].astype(object).fillna('unknown').astype(str)
 
         # Prepare combined text for TF-IDF
         processed_df['tags_str'] = processed_df['tags'].apply(
@@ -77,10 +84,8 @@ class TaskRecommender:
         self.encoder = OneHotEncoder(handle_unknown='ignore', sparse_output=False)
         categorical_features = self.encoder.fit_transform(processed_df[categorical_cols])
         
-        # Combine all features
-        if hasattr(text_features, 'toarray'):
-            text_features = text_features.toarray()
-        return np.hstack((text_features, numeric_features, categorical_features))
+        # Combine all features, keeping the TF-IDF block sparse
+        return sparse.hstack((text_features, numeric_features, categorical_features), format='csr')
 
     def recommend_tasks(self, input_task: dict, df: pd.DataFrame, top_n: int = 3, exclude_completed: bool = True):
         """Recommend similar tasks based on input task with error handling."""
@@ -101,16 +106,25 @@ class TaskRecommender:
             numeric_cols = ['energy_level', 'focus_level', 'difficulty']
             categorical_cols = ['category', 'priority', 'mood', 'intent']
             
-            try:
-                processed_df = self.preprocess_data(work_df)
-            except Exception as e:
-                print(f"Error preprocessing data: {e}")
-                return pd.DataFrame()
+            # Preprocessing and fitting only happen when the candidate rows change
+            fit_key = dataframe_fingerprint(
+                work_df, ['task', 'tags', 'notes'] + numeric_cols + categorical_cols
+            )
+            if fit_key != self._fit_key or self._feature_matrix is None:
+                try:
+                    processed_df = self.preprocess_data(work_df)
+                except Exception as e:
+                    print(f"Error preprocessing data: {e}")
+                    return pd.DataFrame()
             
             try:
-                all_features = self.fit_models(processed_df)
+                if fit_key != self._fit_key or self._feature_matrix is None:
+                    self._feature_matrix = normalize(self.fit_models(processed_df))
+                    self._fit_key = fit_key
+                all_features = self._feature_matrix
             except Exception as e:
                 print(f"Error fitting models: {e}")
+                self._fit_key = None
                 return pd.DataFrame()
         
             # Prepare input task
@@ -131,17 +145,17 @@ class TaskRecommender:
                 return pd.DataFrame()
         
             try:
-                if hasattr(input_text_features, 'toarray'):
-                    input_text_features = input_text_features.toarray()
-                input_features = np.hstack((input_text_features, input_numeric_features, input_categorical_features))
+                input_features = normalize(sparse.hstack(
+                    (input_text_features, input_numeric_features, input_categorical_features), format='csr'
+                ))
                 
-                # Calculate similarity
-                similarity_scores = cosine_similarity(input_features, all_features).flatten()
+                # Rows are already L2-normalized, so the dot product is the cosine similarity
+                similarity_scores = linear_kernel(input_features, all_features).flatten()
                 similar_tasks_series = pd.Series(similarity_scores, index=work_df.index)
                 sorted_similar_tasks = similar_tasks_series.sort_values(ascending=False)
                 
                 # Remove perfect matches (likely the input task itself)
-                perfect_matches = sorted_similar_tasks[sorted_similar_tasks == 1.0].index
+                perfect_matches = sorted_similar_tasks[np.isclose(sorted_similar_tasks, 1.0)].index
                 sorted_similar_tasks = sorted_similar_tasks.drop(perfect_matches, errors='ignore')
                 
                 # Get top N recommendations
@@ -0,0 +1,193 @@
+import os
+from datetime import date, time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+import data_handler
+from data_handler import (
+    DATA_FILE, LEGACY_CSV_FILE, PENDING_CSV_FILE, PENDING_FLUSH_ROWS, add_manual_task,
+    append_clean_tasks, clean_data, get_data_version, load_data, migrate_csv_to_parquet, save_data
+)
+
+CSV_HEADER = "date,task,start_time,end_time,time_taken,category,priority,tags,completed\n"
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """An empty working directory for the task files, with data_handler's load cache cleared."""
+    monkeypatch.chdir(tmp_path)
+    data_handler._invalidate_load_cache()
+    yield tmp_path
+    data_handler._invalidate_load_cache()
+
+
+def write_legacy_csv(rows):
+    with open(LEGACY_CSV_FILE, "w", encoding="utf-8") as f:
+        f.write(CSV_HEADER + "".join(row + "\n" for row in rows))
+
+
+def test_migrate_moves_csv_tasks_to_parquet(store):
+    write_legacy_csv([
+        '2024-01-01,Write,2024-01-01 09:00:00,2024-01-01 09:30:00,30,Coding,High,"a,b",True',
+        "2024-01-02,Read,2024-01-02 10:00:00,2024-01-02 10:45:00,45,Academics,Low,,False",
+    ])
+
+    assert migrate_csv_to_parquet()
+    assert os.path.exists(DATA_FILE)
+    data_handler._invalidate_load_cache()
+    data = load_data()
+    assert sorted(data["task"]) == ["read", "write"]
+    assert data.loc[data["task"] == "write", "tags"].iloc[0] == ["a", "b"]
+
+
+def test_migrate_writes_nothing_when_csv_cannot_be_read(store):
+    with open(LEGACY_CSV_FILE, "wb") as f:
+        f.write(CSV_HEADER.encode() + b"2024-01-01,\xff\xfe,2024-01-01 09:00:00,,30,,,,False\n")
+
+    with pytest.raises(Exception):
+        migrate_csv_to_parquet()
+    assert not os.path.exists(DATA_FILE)
+
+
+def test_migrate_skips_csv_without_valid_tasks(store):
+    write_legacy_csv(["not a date,Write,,,30,Coding,High,,False"])
+
+    assert not migrate_csv_to_parquet()
+    assert not os.path.exists(DATA_FILE)
+
+
+def make_tasks():
+    return clean_data(pd.DataFrame({
+        "date": ["2024-01-01", "2024-01-01", "2024-01-02"],
+        "task": ["Write", "Read", "Plan"],
+        "start_time": ["2024-01-01 09:00:00", "2024-01-01 11:00:00", "2024-01-02 08:00:00"],
+        "time_taken": [30, 45, 15],
+        "category": ["Coding", "Academics", "Coding"],
+        "priority": ["High", "Low", "Medium"],
+        "tags": [["a", "b"], [], ["c"]],
+        "completed": [True, False, False],
+    }))
+
+
+def test_parquet_round_trip_keeps_clean_types(store):
+    tasks = make_tasks()
+    save_data(tasks.copy())
+    data_handler._invalidate_load_cache()
+    loaded = load_data()
+
+    assert pq.read_schema(DATA_FILE).field("tags").type == pa.list_(pa.string())
+    assert loaded["tags"].tolist() == tasks["tags"].tolist()
+    assert loaded["start_time"].dtype == "datetime64[s]"
+    assert loaded["end_time"].dtype == "datetime64[s]"
+    assert loaded["energy_level"].dtype == "int8"
+    assert loaded["completed"].dtype == bool
+    assert isinstance(loaded["priority"].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(loaded[tasks.columns], tasks.reset_index(drop=True))
+
+
+def test_load_data_raises_when_store_is_unreadable(store):
+    with open(DATA_FILE, "wb") as f:
+        f.write(b"not a parquet file")
+
+    with pytest.raises(Exception):
+        load_data()
+
+
+def add_task(name, hour, day=date(2024, 3, 1)):
+    add_manual_task(
+        df=pd.DataFrame(), task_name=name, time_taken=30, task_date=day,
+        start_time_obj=time(hour % 24), tags=["x"], return_data=False
+    )
+
+
+def test_added_task_goes_to_pending_log_not_store(store):
+    save_data(make_tasks())
+    stored = os.path.getmtime(DATA_FILE), os.path.getsize(DATA_FILE)
+
+    add_task("Review", 14)
+
+    assert (os.path.getmtime(DATA_FILE), os.path.getsize(DATA_FILE)) == stored
+    with open(PENDING_CSV_FILE, encoding="utf-8") as f:
+        assert len(f.readlines()) == 2  # Header plus the new task
+    data_handler._invalidate_load_cache()
+    loaded = load_data()
+    assert len(loaded) == 4
+    assert loaded.loc[loaded["task"] == "review", "tags"].iloc[0] == ["x"]
+
+
+def test_pending_log_is_folded_into_store_once_full(store):
+    save_data(make_tasks())
+    for hour in range(PENDING_FLUSH_ROWS - 1):
+        add_task(f"task {hour}", hour, day=date(2024, 3, 1 + hour // 24))
+    assert os.path.exists(PENDING_CSV_FILE)
+
+    add_task("last", 23, day=date(2024, 4, 1))
+
+    assert not os.path.exists(PENDING_CSV_FILE)
+    assert pq.read_metadata(DATA_FILE).num_rows == 3 + PENDING_FLUSH_ROWS
+    data_handler._invalidate_load_cache()
+    assert len(load_data()) == 3 + PENDING_FLUSH_ROWS
+
+
+def test_load_data_cache_returns_independent_copies(store):
+    save_data(make_tasks())
+    first = load_data()
+    first.loc[0, "task"] = "changed"
+
+    assert load_data().loc[0, "task"] != "changed"
+
+
+def test_load_data_rereads_files_changed_outside_the_process(store):
+    save_data(make_tasks())
+    assert len(load_data()) == 3
+
+    # Another writer replaces the store without going through save_data
+    table = pq.read_table(DATA_FILE)
+    pq.write_table(table.slice(0, 1), DATA_FILE)
+
+    assert len(load_data()) == 1
+
+
+def test_data_version_changes_on_every_save(store):
+    tasks = make_tasks()
+    save_data(tasks.copy())
+    version = get_data_version()
+
+    save_data(tasks.copy())  # Same content, so mtime and size may not change
+    assert get_data_version() != version
+
+    version = get_data_version()
+    add_task("Review", 14)
+    assert get_data_version() != version
+
+
+def test_buffered_tasks_on_empty_store_match_a_fresh_load(store):
+    save_data(pd.DataFrame())
+    assert load_data().empty  # Caches the empty store, so the next adds are buffered
+
+    add_task("Write", 9)
+    add_task("Read", 11)
+    buffered = load_data()
+
+    data_handler._invalidate_load_cache()
+    fresh = load_data()
+    assert buffered["energy_level"].dtype == "int8"
+    assert buffered["completed"].dtype == bool
+    pd.testing.assert_frame_equal(buffered, fresh)
+
+
+def test_append_clean_tasks_keeps_categoricals():
+    tasks = make_tasks()
+    imported = clean_data(pd.DataFrame({
+        "date": ["2024-02-01"], "task": ["Gym"], "start_time": ["2024-02-01 07:00:00"],
+        "time_taken": [60], "category": ["Health"], "priority": ["Low"], "tags": [[]]
+    }))
+
+    combined = append_clean_tasks(tasks, imported)
+
+    assert len(combined) == 4
+    assert isinstance(combined["category"].dtype, pd.CategoricalDtype)
+    assert set(combined["category"]) == {"Coding", "Academics", "Health"}
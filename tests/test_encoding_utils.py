@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from encoding_utils import TextFeatureExtractor
+
+TEXTS = [
+    "write the project report",
+    "review the project report draft",
+    "read a chapter on statistics",
+    "statistics homework and review",
+    "plan the week",
+]
+
+
+def test_hashed_tfidf_gives_the_same_similarities_as_tfidf_vectorizer():
+    extractor = TextFeatureExtractor().fit_tfidf(pd.DataFrame({"combined_text": TEXTS}))
+    hashed = extractor.transform_text(TEXTS)
+    reference = TfidfVectorizer(stop_words="english", min_df=2, ngram_range=(1, 2)).fit_transform(TEXTS)
+
+    np.testing.assert_allclose((hashed @ hashed.T).toarray(), (reference @ reference.T).toarray())
+
+
+def test_transform_before_fit_returns_empty():
+    assert TextFeatureExtractor().transform_text(TEXTS).size == 0
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml_models import MLModelHandler
+
+
+@pytest.fixture(scope="module")
+def handler():
+    """A handler with both models trained on a small synthetic task history."""
+    rng = np.random.default_rng(0)
+    n = 200
+    data = pd.DataFrame({
+        "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 60, n), "D"),
+        "start_time": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 60 * 24, n), "h"),
+        "task": "task",
+        "difficulty": rng.integers(1, 6, n),
+        "energy_level": rng.integers(1, 11, n),
+        "focus_level": rng.integers(1, 11, n),
+        "time_taken": rng.integers(10, 120, n).astype(float),
+        "category": rng.choice(["Coding", "Academics", "Personal"], n),
+        "priority": rng.choice(["Low", "Medium", "High"], n),
+        "mood": rng.choice(["Happy", "Tired"], n),
+        "intent": rng.choice(["Learn", "Review"], n),
+        "completed": rng.integers(0, 2, n).astype(bool),
+    })
+    handler = MLModelHandler()
+    handler.train_completion_model(data)
+    handler.train_time_estimation_model(data)
+    assert handler.completion_model is not None and handler.time_model is not None
+    return handler
+
+
+def test_completion_batch_defaults_only_invalid_rows(handler):
+    valid = {"difficulty": 2, "category": "Coding"}
+    probs = handler.predict_completion_probability_batch([{"difficulty": "abc"}, valid, None])
+    
+    assert probs[0] == 50.0
+    assert probs[1] == handler.predict_completion_probability(valid)
+    assert probs[2] == 50.0
+
+
+def test_duration_batch_defaults_only_invalid_rows(handler):
+    valid = {"difficulty": 4, "category": "Academics"}
+    durations = handler.predict_task_duration_batch([valid, {"difficulty": "abc"}])
+    
+    assert durations[0] == handler.predict_task_duration(valid)
+    assert durations[1] == 30
+
+
+def test_batch_without_models_returns_defaults():
+    handler = MLModelHandler()
+    assert handler.predict_completion_probability_batch([{}, {}]) == [50.0, 50.0]
+    assert handler.predict_task_duration_batch([{}]) == [30]
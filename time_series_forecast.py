@@ -477,7 +477,7 @@ class TimeSeriesForecaster:
         if hist_score is not None and forecast_score is not None:
             avg_forecast = forecast_score.mean()
             score_trend = forecast_score.iloc[-1] - forecast_score.iloc[0]
-            trend_direction = '📈 increasing' if score_trend > 1 else '📉 decreasing' if score_trend < -1 else '➡️ stable'
+            trend_direction = 'increasing' if score_trend > 1 else 'decreasing' if score_trend < -1 else 'stable'
             
             summary['productivity'] = {
                 'avg_forecast': round(avg_forecast, 1),
@@ -499,7 +499,7 @@ class TimeSeriesForecaster:
             summary['workload'] = {
                 'total_hours_forecast': round(total_workload / 60, 1),
                 'avg_daily_hours': round(avg_daily / 60, 1),
-                'trend': '📈 increasing' if workload_trend > 10 else '📉 decreasing' if workload_trend < -10 else '➡️ stable',
+                'trend': 'increasing' if workload_trend > 10 else 'decreasing' if workload_trend < -10 else 'stable',
                 'busiest_day': forecast_workload.idxmax().strftime('%A'),
                 'busiest_hours': round(forecast_workload.max() / 60, 1)
             }
@@ -522,7 +522,7 @@ class TimeSeriesForecaster:
             
             summary['completion'] = {
                 'avg_rate': round(avg_completion, 1),
-                'trend': '📈 improving' if completion_trend > 2 else '📉 declining' if completion_trend < -2 else '➡️ stable',
+                'trend': 'improving' if completion_trend > 2 else 'declining' if completion_trend < -2 else 'stable',
                 'best_day': forecast_completion.idxmax().strftime('%A'),
                 'best_rate': round(forecast_completion.max(), 1)
             }
@@ -541,9 +541,9 @@ class TimeSeriesForecaster:
         if 'productivity' in summary:
             prod = summary['productivity']
             if 'trend' in prod:
-                if 'decreasing' in prod['trend'] and prod['trend_magnitude'] > 5:
+                if prod['trend'] == 'decreasing' and prod['trend_magnitude'] > 5:
                     insights.append(f"⚠️ Productivity may decline by {prod['trend_magnitude']}%. Consider adjusting workload.")
-                elif 'increasing' in prod['trend'] and prod['trend_magnitude'] > 5:
+                elif prod['trend'] == 'increasing' and prod['trend_magnitude'] > 5:
                     insights.append(f"✅ Productivity trending up by {prod['trend_magnitude']}%. Keep up the momentum!")
         
         # Check workload balance